@@ -4,9 +4,66 @@ Fiber type detection logic - vendor agnostic.
 Determines Single-Mode vs Multi-Mode fiber based on media type, wavelength, or description.
 """
 
+import re
 from typing import Optional
 
 
+# Fiber type constants
+FIBER_TYPE_SINGLE_MODE = "FIBER_TYPE_SINGLE_MODE"
+FIBER_TYPE_MULTI_MODE = "FIBER_TYPE_MULTI_MODE"
+
+# Separators removed before pattern matching ("100GBASE-SR4" -> "100GBASESR4")
+_STRIP_SEPARATORS = str.maketrans('', '', '- ')
+
+# Discrete wavelengths (nm) with a well-known fiber type
+_WAVELENGTH_FIBER_TYPES = {
+    850: FIBER_TYPE_MULTI_MODE,
+    1310: FIBER_TYPE_SINGLE_MODE,
+    1550: FIBER_TYPE_SINGLE_MODE,
+}
+
+# Multi-mode indicators in media type strings
+_MEDIA_MMF_PATTERNS = (
+    'SR',      # Short Reach (850nm, MMF)
+    'SX',      # Short Wavelength (850nm, MMF)
+    'VCSEL',   # Vertical Cavity Surface Emitting Laser (typically 850nm, MMF)
+    '850NM',
+    'MMF',
+    'MULTIMODE'
+)
+
+# Single-mode indicators in media type strings
+_MEDIA_SMF_PATTERNS = (
+    'LR',      # Long Reach (1310nm, SMF)
+    'ER',      # Extended Reach (1550nm, SMF)
+    'ZR',      # Ultra Long Reach (1550nm, SMF)
+    'LX',      # Long Wavelength (1310nm, SMF)
+    'EX',      # Extended (typically SMF)
+    'ZX',      # Extended Extended (typically SMF)
+    '1310NM',
+    '1550NM',
+    'CWDM',    # Coarse WDM (SMF)
+    'DWDM',    # Dense WDM (SMF)
+    'SMF',
+    'SINGLEMODE'
+)
+
+# Description strings additionally carry free-text reach hints
+_DESC_MMF_PATTERNS = _MEDIA_MMF_PATTERNS + ('SHORT',)
+_DESC_SMF_PATTERNS = _MEDIA_SMF_PATTERNS + ('LONG', 'EXTENDED')
+
+
+def _compile_patterns(patterns) -> re.Pattern:
+    """Build one alternation regex that scans for every pattern in a single pass."""
+    return re.compile('|'.join(re.escape(pattern) for pattern in patterns))
+
+
+_MEDIA_MMF_RE = _compile_patterns(_MEDIA_MMF_PATTERNS)
+_MEDIA_SMF_RE = _compile_patterns(_MEDIA_SMF_PATTERNS)
+_DESC_MMF_RE = _compile_patterns(_DESC_MMF_PATTERNS)
+_DESC_SMF_RE = _compile_patterns(_DESC_SMF_PATTERNS)
+
+
 def determine_fiber_type(
     media_type: Optional[str] = None,
     description: Optional[str] = None,
@@ -35,69 +92,61 @@ def determine_fiber_type(
     """
     # Method 1: Wavelength-based detection (most reliable)
     if wavelength_nm:
-        if wavelength_nm == 850:
-            return "FIBER_TYPE_MULTI_MODE"
-        elif wavelength_nm in [1310, 1550]:
-            return "FIBER_TYPE_SINGLE_MODE"
+        fiber_type = _WAVELENGTH_FIBER_TYPES.get(wavelength_nm)
+        if fiber_type:
+            return fiber_type
         # CWDM/DWDM wavelengths (1270-1610nm range)
-        elif 1270 <= wavelength_nm <= 1610:
-            return "FIBER_TYPE_SINGLE_MODE"
+        if 1270 <= wavelength_nm <= 1610:
+            return FIBER_TYPE_SINGLE_MODE
     
     # Method 2: Media type pattern matching
     if media_type:
-        media_upper = media_type.upper().replace('-', '').replace(' ', '')
+        media_upper = media_type.upper().translate(_STRIP_SEPARATORS)
         
-        # Multi-mode indicators
-        mmf_patterns = [
-            'SR',      # Short Reach (850nm, MMF)
-            'SX',      # Short Wavelength (850nm, MMF)
-            'VCSEL',   # Vertical Cavity Surface Emitting Laser (typically 850nm, MMF)
-            '850NM',
-            'MMF',
-            'MULTIMODE'
-        ]
-        if any(pattern in media_upper for pattern in mmf_patterns):
-            return "FIBER_TYPE_MULTI_MODE"
+        # Multi-mode indicators are checked first so they take priority
+        if _MEDIA_MMF_RE.search(media_upper):
+            return FIBER_TYPE_MULTI_MODE
         
-        # Single-mode indicators
-        smf_patterns = [
-            'LR',      # Long Reach (1310nm, SMF)
-            'ER',      # Extended Reach (1550nm, SMF)
-            'ZR',      # Ultra Long Reach (1550nm, SMF)
-            'LX',      # Long Wavelength (1310nm, SMF)
-            'EX',      # Extended (typically SMF)
-            'ZX',      # Extended Extended (typically SMF)
-            '1310NM',
-            '1550NM',
-            'CWDM',    # Coarse WDM (SMF)
-            'DWDM',    # Dense WDM (SMF)
-            'SMF',
-            'SINGLEMODE'
-        ]
-        if any(pattern in media_upper for pattern in smf_patterns):
-            return "FIBER_TYPE_SINGLE_MODE"
+        if _MEDIA_SMF_RE.search(media_upper):
+            return FIBER_TYPE_SINGLE_MODE
     
     # Method 3: Description pattern matching (fallback)
     if description:
-        desc_upper = description.upper().replace('-', '').replace(' ', '')
+        desc_upper = description.upper().translate(_STRIP_SEPARATORS)
         
-        # Multi-mode indicators
-        mmf_patterns = ['SR', 'SX', 'VCSEL', '850NM', 'MMF', 'MULTIMODE', 'SHORT']
-        if any(pattern in desc_upper for pattern in mmf_patterns):
-            return "FIBER_TYPE_MULTI_MODE"
+        if _DESC_MMF_RE.search(desc_upper):
+            return FIBER_TYPE_MULTI_MODE
         
-        # Single-mode indicators
-        smf_patterns = [
-            'LR', 'ER', 'ZR', 'LX', 'EX', 'ZX',
-            '1310NM', '1550NM', 'CWDM', 'DWDM',
-            'SMF', 'SINGLEMODE', 'LONG', 'EXTENDED'
-        ]
-        if any(pattern in desc_upper for pattern in smf_patterns):
-            return "FIBER_TYPE_SINGLE_MODE"
+        if _DESC_SMF_RE.search(desc_upper):
+            return FIBER_TYPE_SINGLE_MODE
     
     return None
 
 
-# Fiber type constants
-FIBER_TYPE_SINGLE_MODE = "FIBER_TYPE_SINGLE_MODE"
-FIBER_TYPE_MULTI_MODE = "FIBER_TYPE_MULTI_MODE"
+def classify_wavelengths(wavelengths_nm):
+    """
+    Classify many wavelengths at once (wavelength-only rule of determine_fiber_type).
+    
+    Intended for batch callers such as per-lane wavelength columns; scalar
+    callers should keep using determine_fiber_type() to avoid NumPy dispatch
+    overhead on single values.
+    
+    Args:
+        wavelengths_nm: Sequence or array of wavelengths in nanometers (None/NaN allowed)
+    
+    Returns:
+        NumPy object array of "FIBER_TYPE_SINGLE_MODE", "FIBER_TYPE_MULTI_MODE" or None
+        
+    Example:
+        >>> classify_wavelengths([850, 1310, None, 1490]).tolist()
+        ['FIBER_TYPE_MULTI_MODE', 'FIBER_TYPE_SINGLE_MODE', None, 'FIBER_TYPE_SINGLE_MODE']
+    """
+    # Imported lazily so the per-device parsers don't pay the NumPy import cost
+    import numpy as np
+    
+    wavelengths = np.asarray(wavelengths_nm, dtype=np.float64)
+    fiber_types = np.full(wavelengths.shape, None, dtype=object)
+    # 1310/1550nm and the CWDM/DWDM band all fall inside 1270-1610nm
+    fiber_types[(wavelengths >= 1270) & (wavelengths <= 1610)] = FIBER_TYPE_SINGLE_MODE
+    fiber_types[wavelengths == 850] = FIBER_TYPE_MULTI_MODE
+    return fiber_types
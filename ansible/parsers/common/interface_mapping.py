@@ -4,6 +4,7 @@ Interface naming conventions and FPC/PIC/Port mapping logic.
 Maps chassis hardware locations to interface names across different vendors and platforms.
 """
 
+from functools import lru_cache
 from typing import Optional, Dict
 import re
 
@@ -40,7 +41,18 @@ JUNIPER_PREFIX_MAP = {
     'ex4600': 'et',
 }
 
+# Prefix map entries ordered longest key first so the most specific platform
+# wins (e.g. 'ex4300' is matched before the generic 'ex' family entry)
+_PLATFORM_PREFIXES = tuple(
+    sorted(JUNIPER_PREFIX_MAP.items(), key=lambda item: len(item[0]), reverse=True)
+)
 
+# Chassis module names: "FPC 0", "PIC 1", "Xcvr 32"
+_MODULE_NAME_RE = re.compile(r'(?P<kind>FPC|PIC|Xcvr)\s+(?P<number>\d+)', re.IGNORECASE)
+_MODULE_KIND_TYPES = {'fpc': 'fpc', 'pic': 'pic', 'xcvr': 'port'}
+
+
+@lru_cache(maxsize=4096)
 def parse_juniper_interface_name(
     fpc: str,
     pic: str,
@@ -49,6 +61,8 @@ def parse_juniper_interface_name(
 ) -> Optional[str]:
     """
     Map Juniper FPC/PIC/Port to interface name.
+    Results are memoized since the same platform hint and slot numbers
+    repeat for every transceiver in a chassis.
     
     Args:
         fpc: FPC (Flexible PIC Concentrator) number
@@ -70,7 +84,7 @@ def parse_juniper_interface_name(
     
     if platform_hint:
         platform_lower = platform_hint.lower()
-        for key, val in JUNIPER_PREFIX_MAP.items():
+        for key, val in _PLATFORM_PREFIXES:
             if key in platform_lower:
                 prefix = val
                 break
@@ -79,6 +93,7 @@ def parse_juniper_interface_name(
     return f"{prefix}-{fpc}/{pic}/{port}"
 
 
+@lru_cache(maxsize=1024)
 def extract_fpc_pic_port(module_name: str) -> Optional[Dict[str, str]]:
     """
     Extract FPC, PIC, and Port numbers from module names.
@@ -87,7 +102,8 @@ def extract_fpc_pic_port(module_name: str) -> Optional[Dict[str, str]]:
         module_name: Module name (e.g., "FPC 0", "PIC 1", "Xcvr 6")
     
     Returns:
-        Dictionary with extracted numbers or None
+        Dictionary with extracted numbers or None. Results are memoized and
+        shared between callers, so the returned dictionary must not be mutated.
         
     Examples:
         >>> extract_fpc_pic_port("FPC 0")
@@ -95,20 +111,10 @@ def extract_fpc_pic_port(module_name: str) -> Optional[Dict[str, str]]:
         >>> extract_fpc_pic_port("Xcvr 32")
         {'type': 'port', 'number': '32'}
     """
-    # Match FPC
-    fpc_match = re.search(r'FPC\s+(\d+)', module_name, re.IGNORECASE)
-    if fpc_match:
-        return {'type': 'fpc', 'number': fpc_match.group(1)}
-    
-    # Match PIC
-    pic_match = re.search(r'PIC\s+(\d+)', module_name, re.IGNORECASE)
-    if pic_match:
-        return {'type': 'pic', 'number': pic_match.group(1)}
-    
-    # Match Xcvr (transceiver/port)
-    xcvr_match = re.search(r'Xcvr\s+(\d+)', module_name, re.IGNORECASE)
-    if xcvr_match:
-        return {'type': 'port', 'number': xcvr_match.group(1)}
+    match = _MODULE_NAME_RE.search(module_name)
+    if match:
+        return {'type': _MODULE_KIND_TYPES[match.group('kind').lower()],
+                'number': match.group('number')}
     
     return None
 
@@ -130,15 +136,13 @@ def parse_interface_base_name(interface_name: str) -> str:
         >>> parse_interface_base_name("xe-0/0/48")
         'et-0/0/48'
     """
-    # Remove channelized interface suffix (:N)
-    base_name = interface_name.split(':')[0] if ':' in interface_name else interface_name
+    # Remove channelized interface suffix (:N); partition is a single C call
+    # and returns the whole name when there is no colon
+    base_name = interface_name.partition(':')[0]
     
     # Normalize xe- prefix to et- for consistent matching with chassis inventory
     # The chassis inventory always uses et- prefix, but optics diagnostics may use xe-
-    if base_name.startswith('xe-'):
-        base_name = 'et-' + base_name[3:]
-    
-    return base_name
+    return 'et-' + base_name[3:] if base_name.startswith('xe-') else base_name
 
 
 def get_interface_channel(interface_name: str) -> Optional[int]:
@@ -157,9 +161,10 @@ def get_interface_channel(interface_name: str) -> Optional[int]:
         >>> get_interface_channel("xe-0/0/48")
         None
     """
-    if ':' in interface_name:
-        try:
-            return int(interface_name.split(':')[1])
-        except (ValueError, IndexError):
-            return None
-    return None
+    _, sep, channel = interface_name.rpartition(':')
+    if not sep:
+        return None
+    try:
+        return int(channel)
+    except ValueError:
+        return None
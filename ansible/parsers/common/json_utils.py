@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+JSON input/output helpers shared by all parsers.
+Uses orjson (C/Rust encoder) when installed and falls back to the standard library.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def read_json(path: str) -> Any:
+    """
+    Load JSON data from a file.
+    
+    Args:
+        path: Input file path
+        
+    Returns:
+        Decoded JSON data
+        
+    Raises:
+        IOError: If the file cannot be read
+        json.JSONDecodeError: If the file is not valid JSON (orjson's decode
+            error is a subclass, so callers can catch the stdlib type)
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+@contextmanager
+def _replace_on_success(path: str, mode: str):
+    """
+    Open a temporary file next to path and atomically move it over path on success.
+    
+    Readers never see a truncated or half-written file. The playbook
+    rewrites some metrics files in place, and a failed write leaves the
+    previous file intact. No fsync is done: the outputs are regenerated
+    every collection run.
+    
+    Args:
+        path: Final output file path
+        mode: File mode for the temporary file ('w' or 'wb')
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json(path: str, data: Any, default: Optional[Callable[[Any], Any]] = None) -> None:
+    """
+    Write data to a file as JSON indented by two spaces.
+    
+    The file is replaced atomically, so an interrupted write leaves the
+    previous contents in place.
+    
+    Args:
+        path: Output file path
+        data: JSON-serializable data
+        default: Optional callable converting unsupported objects to serializable ones
+        
+    Raises:
+        IOError: If the file cannot be written
+        TypeError: If data contains objects that cannot be serialized
+    """
+    if orjson is not None:
+        # orjson encodes straight to bytes, so write in binary mode
+        with _replace_on_success(path, 'wb') as f:
+            f.write(orjson.dumps(data, default=default, option=orjson.OPT_INDENT_2))
+    else:
+        with _replace_on_success(path, 'w') as f:
+            json.dump(data, f, indent=2, default=default)
+
+
+def write_ndjson(path: str, records: Iterable[Any]) -> None:
+    """
+    Write records to a file as newline-delimited JSON, one compact record per line.
+    
+    Args:
+        path: Output file path
+        records: JSON-serializable records
+        
+    Raises:
+        IOError: If the file cannot be written
+        TypeError: If a record contains objects that cannot be serialized
+    """
+    if orjson is not None:
+        with _replace_on_success(path, 'wb') as f:
+            for record in records:
+                f.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+    else:
+        with _replace_on_success(path, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(',', ':')))
+                f.write('\n')
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test suite for fiber_detection.py batch wavelength classification
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from parsers.common.fiber_detection import (
+    classify_wavelengths, determine_fiber_type,
+    FIBER_TYPE_MULTI_MODE, FIBER_TYPE_SINGLE_MODE,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipUnless(np is not None, 'numpy not installed')
+class TestClassifyWavelengths(unittest.TestCase):
+    """Test classify_wavelengths agrees with the scalar wavelength rule"""
+    
+    def test_matches_determine_fiber_type(self):
+        """Test every wavelength classifies as determine_fiber_type does"""
+        wavelengths = [850, 1310, 1490, 1550, None, 0, 1270, 1610, 1611, 900]
+        
+        result = classify_wavelengths(wavelengths)
+        
+        self.assertEqual(result.tolist(),
+                         [determine_fiber_type(wavelength_nm=w) for w in wavelengths])
+        self.assertEqual(result.tolist()[:6], [
+            FIBER_TYPE_MULTI_MODE, FIBER_TYPE_SINGLE_MODE, FIBER_TYPE_SINGLE_MODE,
+            FIBER_TYPE_SINGLE_MODE, None, None,
+        ])
+    
+    def test_array_input(self):
+        """Test a float array with NaN keeps its shape"""
+        result = classify_wavelengths(np.array([[850.0, np.nan], [1550.0, 1310.0]]))
+        
+        self.assertEqual(result.shape, (2, 2))
+        self.assertEqual(result.tolist(), [[FIBER_TYPE_MULTI_MODE, None],
+                                           [FIBER_TYPE_SINGLE_MODE, FIBER_TYPE_SINGLE_MODE]])
+    
+    def test_empty(self):
+        """Test an empty input gives an empty result"""
+        self.assertEqual(classify_wavelengths([]).tolist(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
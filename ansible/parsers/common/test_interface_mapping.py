@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test suite for interface_mapping.py platform prefix selection
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from parsers.common.interface_mapping import parse_juniper_interface_name
+
+
+class TestPlatformPrefix(unittest.TestCase):
+    """Test the most specific platform entry picks the interface prefix"""
+    
+    def assert_name(self, platform_hint, expected):
+        self.assertEqual(parse_juniper_interface_name('0', '0', '6', platform_hint), expected)
+    
+    def test_ex4300_uses_ge(self):
+        """Test EX4300 models are not shadowed by the generic 'ex' entry"""
+        for hint in ('ex4300', 'ex4300-48t', 'EX4300-48P'):
+            self.assert_name(hint, 'ge-0/0/6')
+    
+    def test_ex4600_uses_et(self):
+        """Test EX4600 models are not shadowed by the generic 'ex' entry"""
+        for hint in ('ex4600', 'ex4600-40f'):
+            self.assert_name(hint, 'et-0/0/6')
+    
+    def test_other_ex_models_use_xe(self):
+        """Test EX models without their own entry keep the family prefix"""
+        for hint in ('ex', 'ex2300-24t', 'ex9208'):
+            self.assert_name(hint, 'xe-0/0/6')
+    
+    def test_qfx_models(self):
+        """Test QFX model entries"""
+        self.assert_name('qfx5100-48s', 'xe-0/0/6')
+        self.assert_name('qfx5110', 'xe-0/0/6')
+        self.assert_name('qfx5240-64od', 'et-0/0/6')
+    
+    def test_mx_and_ptx(self):
+        """Test MX and PTX platforms use et"""
+        for hint in ('mx960', 'mx10003', 'ptx10008', 'ptx1000'):
+            self.assert_name(hint, 'et-0/0/6')
+    
+    def test_no_hint(self):
+        """Test the default prefix without a platform hint"""
+        self.assert_name(None, 'et-0/0/6')
+        self.assert_name('srx345', 'et-0/0/6')
+
+
+if __name__ == '__main__':
+    unittest.main()
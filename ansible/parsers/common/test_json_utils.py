@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test suite for json_utils.py
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from parsers.common import json_utils
+from parsers.common.json_utils import read_json, write_json, write_ndjson
+
+
+RECORDS = [
+    {'if_name': 'et-0/0/0', 'temperature': 39.5, 'lane': 0, 'vendor': 'JUNIPER', 'tx_bias': None},
+    {'if_name': 'et-0/0/1', 'temperature': -2.25, 'lane': 3, 'vendor': 'Café "Optics"', 'tx_bias': 6.1},
+]
+
+
+class Unserializable:
+    """Object neither encoder can serialize"""
+
+
+class JsonUtilsMixin:
+    """Atomic write and round-trip checks, run once per encoder"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'metrics.json')
+        write_json(self.path, {'interfaces': RECORDS})
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def assert_original_intact(self):
+        self.assertEqual(read_json(self.path), {'interfaces': RECORDS})
+        self.assertEqual(os.listdir(self.tmp.name), ['metrics.json'])
+    
+    def test_write_json_failure(self):
+        """Test a serializer error keeps the original file and removes the temp file"""
+        with self.assertRaises(TypeError):
+            write_json(self.path, {'interfaces': [RECORDS[0], Unserializable()]})
+        self.assert_original_intact()
+    
+    def test_write_ndjson_failure_after_partial_write(self):
+        """Test a record failing mid-stream keeps the original file and removes the temp file"""
+        with self.assertRaises(TypeError):
+            write_ndjson(self.path, [RECORDS[0], Unserializable()])
+        self.assert_original_intact()
+    
+    def test_write_json_round_trip(self):
+        """Test write_json output replaces the file and reads back unchanged"""
+        data = {'device': 'dev1', 'interfaces': RECORDS, 'lanes': []}
+        write_json(self.path, data)
+        
+        self.assertEqual(read_json(self.path), data)
+    
+    def test_write_json_default(self):
+        """Test the default hook converts unsupported objects"""
+        write_json(self.path, {'item': Unserializable()}, default=lambda obj: 'converted')
+        
+        self.assertEqual(read_json(self.path), {'item': 'converted'})
+    
+    def test_write_ndjson_round_trip(self):
+        """Test write_ndjson writes one record per line"""
+        path = os.path.join(self.tmp.name, 'metrics.ndjson')
+        write_ndjson(path, iter(RECORDS))
+        
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), len(RECORDS))
+        for line, record in zip(lines, RECORDS):
+            # Each line is itself a JSON document readable by read_json
+            line_path = os.path.join(self.tmp.name, 'line.json')
+            with open(line_path, 'w') as f:
+                f.write(line)
+            self.assertEqual(read_json(line_path), record)
+
+
+@unittest.skipUnless(json_utils.orjson is not None, 'orjson not installed')
+class TestJsonUtilsOrjson(JsonUtilsMixin, unittest.TestCase):
+    """json_utils with orjson"""
+
+
+class TestJsonUtilsStdlib(JsonUtilsMixin, unittest.TestCase):
+    """json_utils with the stdlib json fallback"""
+    
+    def setUp(self):
+        patcher = mock.patch.object(json_utils, 'orjson', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+
+if __name__ == '__main__':
+    unittest.main()
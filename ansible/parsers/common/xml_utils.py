@@ -4,7 +4,7 @@ Common XML parsing utilities for all vendors.
 Provides namespace-agnostic XML element access.
 """
 
-from typing import Optional, List
+from typing import Dict, Optional, List
 import xml.etree.ElementTree as ET
 
 
@@ -22,7 +22,31 @@ def strip_namespace(tag: str) -> str:
         >>> strip_namespace('{http://xml.juniper.net/junos/22.1R1/junos}interface-information')
         'interface-information'
     """
-    return tag.split('}', 1)[1] if '}' in tag else tag
+    # rpartition returns the whole tag when there is no namespace
+    return tag.rpartition('}')[2]
+
+
+def namespace_prefix(element: ET.Element) -> str:
+    """
+    Return the Clark-notation namespace prefix of an element's tag.
+    
+    Junos RPC replies put every element of a section in one namespace, so the
+    prefix of a parent can be combined with bare tag names and passed to the
+    built-in element.find()/findall()/findtext(), which match in C instead of
+    calling strip_namespace() per child.
+    
+    Args:
+        element: XML element
+        
+    Returns:
+        '{namespace-uri}' or '' if the tag has no namespace
+        
+    Example:
+        >>> namespace_prefix(ET.fromstring('<a xmlns="urn:x"/>'))
+        '{urn:x}'
+    """
+    tag = element.tag
+    return tag[:tag.index('}') + 1] if tag.startswith('{') else ''
 
 
 def findtext_ns(element: ET.Element, tag: str, default: Optional[str] = None) -> Optional[str]:
@@ -46,6 +70,28 @@ def findtext_ns(element: ET.Element, tag: str, default: Optional[str] = None) ->
     return default
 
 
+def child_texts(element: ET.Element) -> Dict[str, Optional[str]]:
+    """
+    Map the local tag names of an element's children to their text.
+    
+    One pass over the children, for parsers that read many fields from the
+    same element; cheaper than a findtext_ns() scan per field. Repeated tags
+    keep the last occurrence.
+    
+    Args:
+        element: Parent XML element
+        
+    Returns:
+        Dictionary of tag name (without namespace) -> text (None if empty)
+        
+    Example:
+        >>> child_texts(ET.fromstring('<port xmlns="urn:x"><port-number>3</port-number></port>'))
+        {'port-number': '3'}
+    """
+    return {child.tag.rpartition('}')[2]: child.text
+            for child in element if isinstance(child.tag, str)}
+
+
 def find_ns(element: ET.Element, tag: str) -> Optional[ET.Element]:
     """
     Find first child element with tag, ignoring namespace.
@@ -98,11 +144,11 @@ def findall_recursive_ns(element: ET.Element, tag: str) -> List[ET.Element]:
     if element is None:
         return []
     
-    results = []
-    for child in element.iter():
-        if strip_namespace(child.tag) == tag:
-            results.append(child)
-    return results
+    # Compare against the namespaced suffix directly rather than calling
+    # strip_namespace() (and allocating a stripped copy) for every node
+    suffix = '}' + tag
+    return [child for child in element.iter()
+            if child.tag == tag or child.tag.endswith(suffix)]
 
 
 def extract_numeric_value(text: Optional[str], default: Optional[float] = None) -> Optional[float]:
@@ -125,9 +171,15 @@ def extract_numeric_value(text: Optional[str], default: Optional[float] = None)
     if not text:
         return default
     
+    # Most values are bare numbers; float() accepts surrounding whitespace,
+    # so only split off units when the direct conversion fails
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    
     try:
         # Remove common units and extract numeric part
-        cleaned = text.strip().split()[0]
-        return float(cleaned)
+        return float(text.split()[0])
     except (ValueError, IndexError):
         return default
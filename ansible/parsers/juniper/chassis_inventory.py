@@ -8,18 +8,131 @@ RPC: <get-chassis-inventory/>
 """
 
 import argparse
-import xml.etree.ElementTree as ET
+import glob
+import io
 import sys
-import json
-import re
 from typing import Dict, Optional
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from lxml import etree
 
 # Add parent directory to path for imports
 # sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from parsers.common.xml_utils import strip_namespace, findtext_ns, findall_ns, findall_recursive_ns
+from parsers.common.xml_utils import strip_namespace, namespace_prefix
 from parsers.common.interface_mapping import parse_juniper_interface_name, extract_fpc_pic_port
+from parsers.common.json_utils import write_json
+
+
+# Placeholder serial numbers reported for empty or built-in slots
+_SERIAL_PLACEHOLDERS = frozenset(('N/A', 'BUILTIN', ''))
+
+# Leading text of chassis module names for each module kind ("FPC 0", "PIC 1", "Xcvr 6")
+_MODULE_NAME_PREFIXES = {'fpc': 'FPC', 'pic': 'PIC', 'port': 'Xcvr'}
+
+
+def module_number(module_name: Optional[str], kind: str) -> Optional[str]:
+    """
+    Return the slot number of a chassis module if it is of the given kind.
+    
+    The cheap prefix test rejects other modules (fans, power supplies, ...)
+    before the cached extract_fpc_pic_port() lookup classifies the name.
+    
+    Args:
+        module_name: Module name (e.g., "FPC 0", "Xcvr 32")
+        kind: Module kind ('fpc', 'pic' or 'port')
+    
+    Returns:
+        Slot number as string, or None if the module is not of that kind
+    """
+    if not module_name or not module_name.startswith(_MODULE_NAME_PREFIXES[kind]):
+        return None
+    module_info = extract_fpc_pic_port(module_name)
+    if not module_info or module_info['type'] != kind:
+        return None
+    return module_info['number']
+
+
+class TransceiverInfo:
+    """
+    Chassis inventory record for a single transceiver slot.
+    
+    Uses __slots__ instead of a per-transceiver dict: dense chassis carry
+    hundreds of these and a slotted instance is a fraction of a dict's size.
+    Only the serial number is known from chassis inventory; all other
+    transceiver metadata comes from PIC detail.
+    """
+    __slots__ = ('serial_number',)
+    
+    def __init__(self, serial_number: Optional[str] = None):
+        self.serial_number = serial_number
+    
+    def get(self, name: str, default=None):
+        """Return a field by name, or default if it was not reported (dict-style access)."""
+        value = getattr(self, name, None)
+        return default if value is None else value
+    
+    def to_dict(self) -> Dict:
+        """Return the JSON form of the record, omitting fields that were not reported."""
+        return {name: getattr(self, name) for name in self.__slots__
+                if getattr(self, name) is not None}
+
+
+def parse_fpc_module(fpc_elem, platform_hint: Optional[str] = None) -> Dict[str, TransceiverInfo]:
+    """
+    Extract transceivers from a single FPC chassis-module subtree.
+    
+    Args:
+        fpc_elem: chassis-module XML element
+        platform_hint: Optional platform identifier for interface name mapping
+    
+    Returns:
+        Dict mapping interface names to TransceiverInfo records.
+        Empty if the module is not an FPC.
+    """
+    transceivers = {}
+    
+    # All descendants share the module's namespace, so qualified tags can be
+    # matched by the built-in find/findall instead of per-child tag stripping
+    ns = namespace_prefix(fpc_elem)
+    name_tag = ns + 'name'
+    
+    # Skip if not an FPC
+    fpc_num = module_number(fpc_elem.findtext(name_tag), 'fpc')
+    if fpc_num is None:
+        return transceivers
+    
+    # Find all PICs within this FPC
+    for pic_elem in fpc_elem.findall(ns + 'chassis-sub-module'):
+        # Skip if not a PIC
+        pic_num = module_number(pic_elem.findtext(name_tag), 'pic')
+        if pic_num is None:
+            continue
+        
+        # Find all transceivers (Xcvr) within this PIC
+        for xcvr_elem in pic_elem.findall(ns + 'chassis-sub-sub-module'):
+            # Skip if not a transceiver
+            xcvr_num = module_number(xcvr_elem.findtext(name_tag), 'port')
+            if xcvr_num is None:
+                continue
+            
+            # Map to interface name
+            interface_name = parse_juniper_interface_name(
+                fpc_num, pic_num, xcvr_num, platform_hint
+            )
+            
+            # Extract serial number from chassis inventory
+            # (PIC detail doesn't provide serial numbers)
+            serial_number = xcvr_elem.findtext(ns + 'serial-number')
+            
+            # Only track that this interface exists with serial number
+            # Other transceiver metadata comes from PIC detail command
+            if interface_name:
+                if not serial_number or serial_number in _SERIAL_PLACEHOLDERS:
+                    serial_number = None
+                transceivers[interface_name] = TransceiverInfo(serial_number)
+    
+    return transceivers
 
 
 def parse_chassis_inventory(xml_content: str, device: str, platform_hint: Optional[str] = None) -> Dict:
@@ -30,8 +143,12 @@ def parse_chassis_inventory(xml_content: str, device: str, platform_hint: Option
     All transceiver metadata (vendor, part_number, serial_number, media_type, fiber_type, wavelength)
     MUST come from PIC detail command (show chassis pic fpc-slot X pic-slot Y).
     
+    The document is streamed: each chassis-module subtree is cleared as soon as
+    its transceivers are extracted, so peak memory is bounded by one module
+    rather than the whole inventory.
+    
     Args:
-        xml_content: XML string from get-chassis-inventory RPC response
+        xml_content: XML string or bytes from get-chassis-inventory RPC response
         device: Device hostname/IP
         platform_hint: Optional platform identifier for interface name mapping
     
@@ -39,105 +156,161 @@ def parse_chassis_inventory(xml_content: str, device: str, platform_hint: Option
         Dictionary with:
         - device: Device identifier
         - origin_name: Device serial number
-        - transceivers: Dict mapping interface names (for structure only, no metadata)
+        - transceivers: Dict mapping interface names to TransceiverInfo records
+          (structure and serial number only, use to_dict() for the JSON form)
     """
-    try:
-        root = ET.fromstring(xml_content)
-    except ET.ParseError as e:
-        print(f"Error parsing XML: {e}", file=sys.stderr)
-        return {'device': device, 'origin_name': None, 'transceivers': {}}
-    
     result = {
         'device': device,
         'origin_name': None,  # Device serial number
         'transceivers': {}     # Interface name -> transceiver metadata
     }
     
-    # Find chassis element to get device serial number
-    for chassis in findall_recursive_ns(root, 'chassis'):
-        serial_number = findtext_ns(chassis, 'serial-number')
-        if serial_number:
-            result['origin_name'] = serial_number
-            break
+    if isinstance(xml_content, str):
+        xml_content = xml_content.encode('utf-8')
+    
+    try:
+        # chassis-module elements end before their parent chassis, so by the time
+        # the chassis end event fires only its own small children remain
+        for _, elem in etree.iterparse(io.BytesIO(xml_content), events=('end',),
+                                       tag=('{*}chassis', '{*}chassis-module'),
+                                       remove_comments=True, remove_pis=True):
+            if strip_namespace(elem.tag) == 'chassis':
+                # Device serial number comes from the first chassis that has one
+                if result['origin_name'] is None:
+                    result['origin_name'] = elem.findtext(namespace_prefix(elem) + 'serial-number') or None
+            else:
+                result['transceivers'].update(parse_fpc_module(elem, platform_hint))
+                elem.clear()
+    except etree.XMLSyntaxError as e:
+        print(f"Error parsing XML: {e}", file=sys.stderr)
+        return {'device': device, 'origin_name': None, 'transceivers': {}}
+    
+    return result
+
+
+def parse_file(input_path: str, output_path: str, device: str,
+               platform_hint: Optional[str] = None) -> Dict:
+    """
+    Parse one chassis inventory XML file and write the JSON result.
     
-    # Find all FPC modules
-    for fpc_elem in findall_recursive_ns(root, 'chassis-module'):
-        module_name = findtext_ns(fpc_elem, 'name', '')
+    Module-level so it can be submitted to a ProcessPoolExecutor.
+    
+    Args:
+        input_path: Path to the get-chassis-inventory XML reply
+        output_path: Path of the JSON file to write
+        device: Device hostname/IP
+        platform_hint: Optional platform name (e.g., 'qfx5240')
         
-        # Skip if not an FPC
-        if not module_name.startswith('FPC'):
-            continue
+    Returns:
+        The parsed result dictionary
+    """
+    with open(input_path, 'rb') as f:
+        xml_content = f.read()
+    
+    result = parse_chassis_inventory(xml_content, device, platform_hint)
+    write_json(output_path, result, default=TransceiverInfo.to_dict)
+    return result
+
+
+def _device_from_filename(filename: str) -> str:
+    """
+    Derive the device name from a playbook output file name.
+    
+    Files are named {device}_chassis_inventory_raw.xml by the playbook, so
+    everything before the suffix is the device. Other names fall back to
+    the file stem.
+    """
+    suffix = '_chassis_inventory_raw.xml'
+    if filename.endswith(suffix):
+        return filename[:-len(suffix)]
+    return os.path.splitext(filename)[0]
+
+
+def parse_directory(input_dir: str, output_dir: str, pattern: str,
+                    platform_hint: Optional[str] = None,
+                    workers: Optional[int] = None) -> int:
+    """
+    Parse every matching XML file in a directory using a process pool.
+    
+    Output files are written as {device}_chassis_inventory_metrics.json.
+    
+    Args:
+        input_dir: Directory holding chassis inventory XML files
+        output_dir: Directory to write JSON results into
+        pattern: Glob pattern selecting input files
+        platform_hint: Optional platform name (e.g., 'qfx5240')
+        workers: Number of worker processes (defaults to CPU count)
         
-        # Extract FPC number
-        fpc_info = extract_fpc_pic_port(module_name)
-        if not fpc_info or fpc_info['type'] != 'fpc':
-            continue
-        fpc_num = fpc_info['number']
+    Returns:
+        Number of files that failed to parse or write
+    """
+    input_paths = sorted(glob.glob(os.path.join(input_dir, pattern)))
+    if not input_paths:
+        print(f"No files matching {pattern} in {input_dir}", file=sys.stderr)
+        return 0
+    
+    os.makedirs(output_dir, exist_ok=True)
+    
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for input_path in input_paths:
+            device = _device_from_filename(os.path.basename(input_path))
+            output_path = os.path.join(output_dir, f"{device}_chassis_inventory_metrics.json")
+            future = pool.submit(parse_file, input_path, output_path, device, platform_hint)
+            futures[future] = input_path
         
-        # Find all PICs within this FPC
-        for pic_elem in findall_ns(fpc_elem, 'chassis-sub-module'):
-            pic_name = findtext_ns(pic_elem, 'name', '')
-            
-            # Skip if not a PIC
-            if not pic_name.startswith('PIC'):
+        for future in as_completed(futures):
+            input_path = futures[future]
+            try:
+                result = future.result()
+            except (IOError, OSError) as e:
+                print(f"Error processing {input_path}: {e}", file=sys.stderr)
+                failures += 1
                 continue
             
-            # Extract PIC number
-            pic_info = extract_fpc_pic_port(pic_name)
-            if not pic_info or pic_info['type'] != 'pic':
-                continue
-            pic_num = pic_info['number']
-            
-            # Find all transceivers (Xcvr) within this PIC
-            for xcvr_elem in findall_ns(pic_elem, 'chassis-sub-sub-module'):
-                xcvr_name = findtext_ns(xcvr_elem, 'name', '')
-                
-                # Skip if not a transceiver
-                if not xcvr_name.startswith('Xcvr'):
-                    continue
-                
-                # Extract Xcvr number
-                xcvr_info = extract_fpc_pic_port(xcvr_name)
-                if not xcvr_info or xcvr_info['type'] != 'port':
-                    continue
-                xcvr_num = xcvr_info['number']
-                
-                # Map to interface name
-                interface_name = parse_juniper_interface_name(
-                    fpc_num, pic_num, xcvr_num, platform_hint
-                )
-                
-                # Extract serial number from chassis inventory
-                # (PIC detail doesn't provide serial numbers)
-                serial_number = findtext_ns(xcvr_elem, 'serial-number')
-                
-                # Only track that this interface exists with serial number
-                # Other transceiver metadata comes from PIC detail command
-                if interface_name:
-                    transceiver_data = {}
-                    if serial_number and serial_number not in ['N/A', 'BUILTIN', '']:
-                        transceiver_data['serial_number'] = serial_number
-                    result['transceivers'][interface_name] = transceiver_data
+            transceiver_count = len(result['transceivers'])
+            origin_name = result.get('origin_name', 'Not found')
+            print(f"{result['device']}: extracted {transceiver_count} transceiver(s), "
+                  f"device serial: {origin_name}")
     
-    return result
+    return failures
 
 
 def main():
     parser = argparse.ArgumentParser(
         description='Parse Junos chassis inventory to JSON format'
     )
-    parser.add_argument('--input', required=True, help='Input XML file')
-    parser.add_argument('--output', required=True, help='Output JSON file')
-    parser.add_argument('--device', required=True, help='Device hostname/IP')
+    parser.add_argument('--input', help='Input XML file')
+    parser.add_argument('--output', help='Output JSON file')
+    parser.add_argument('--device', help='Device hostname/IP (required with --input)')
+    parser.add_argument('--input-dir', help='Directory of input XML files to parse in parallel')
+    parser.add_argument('--output-dir', help='Directory to write JSON files into (with --input-dir)')
+    parser.add_argument('--pattern', default='*_chassis_inventory_raw.xml',
+                        help='Glob pattern for files in --input-dir')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for --input-dir (default: CPU count)')
     parser.add_argument('--platform', help='Platform hint for interface mapping (e.g., qfx5240)')
     parser.add_argument('--format', default='json', choices=['json'],
                         help='Output format (only json supported)')
     
     args = parser.parse_args()
     
+    if args.input_dir:
+        if not args.output_dir:
+            parser.error('--output-dir is required with --input-dir')
+        failures = parse_directory(args.input_dir, args.output_dir, args.pattern,
+                                   args.platform, args.workers)
+        if failures:
+            sys.exit(1)
+        return
+    
+    if not (args.input and args.output and args.device):
+        parser.error('--input, --output and --device are required unless --input-dir is given')
+    
     # Read input XML
     try:
-        with open(args.input, 'r') as f:
+        with open(args.input, 'rb') as f:
             xml_content = f.read()
     except IOError as e:
         print(f"Error reading input file: {e}", file=sys.stderr)
@@ -148,8 +321,7 @@ def main():
     
     # Write output
     try:
-        with open(args.output, 'w') as f:
-            json.dump(result, f, indent=2)
+        write_json(args.output, result, default=TransceiverInfo.to_dict)
         
         transceiver_count = len(result['transceivers'])
         origin_name = result.get('origin_name', 'Not found')
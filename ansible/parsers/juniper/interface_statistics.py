@@ -20,11 +20,21 @@ Note: Uses standard 'show interfaces' RPC (not extensive) to minimize compute im
 """
 
 import sys
-import json
 import argparse
+import io
+import os
 import time
-from typing import Dict, List, Any, Optional
-import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, BinaryIO, Dict, FrozenSet, List, Optional, Tuple, Union
+from lxml import etree
+
+from parsers.common.json_utils import write_json, write_ndjson
+from parsers.common.xml_utils import child_texts
+
+
+# Thousands separators in counters like "1,234"
+_COMMA_DROP = str.maketrans('', '', ',')
 
 
 def extract_numeric_value(text: str) -> Optional[float]:
@@ -45,14 +55,73 @@ def extract_numeric_value(text: str) -> Optional[float]:
     if not text:
         return None
     
+    # Clean counters are the common case; float() ignores surrounding whitespace
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    except TypeError:
+        return None
+    
     try:
         # Remove commas from numbers like "1,234"
-        cleaned = text.strip().replace(',', '')
-        return float(cleaned)
-    except (ValueError, AttributeError):
+        return float(text.translate(_COMMA_DROP))
+    except ValueError:
         return None
 
 
+# (output key, XML tag) extraction tables, applied in order
+_STATUS_FIELDS = (
+    ('admin_status', 'admin-status'),
+    ('oper_status', 'oper-status'),
+)
+
+_TRAFFIC_FIELDS = (
+    ('input_bps', 'input-bps'),
+    ('input_pps', 'input-pps'),
+    ('output_bps', 'output-bps'),
+    ('output_pps', 'output-pps'),
+)
+
+_FEC_FIELDS = (
+    ('fec_ccw', 'fec_ccw_count'),                    # 1. FEC Corrected Codewords (cumulative)
+    ('fec_nccw', 'fec_nccw_count'),                  # 2. FEC Uncorrected Codewords - TARGET VARIABLE
+    ('fec_ccw_error_rate', 'fec_ccw_error_rate'),    # 3. FEC Corrected Error Rate
+    ('fec_nccw_error_rate', 'fec_nccw_error_rate'),  # 4. FEC Uncorrected Error Rate
+    ('pre_fec_ber', 'pre-fec-ber'),                  # 5. Pre-FEC BER in scientific notation
+)
+
+# (total, live, harvest) output keys for the standard FEC histogram bins 0-15
+_HISTOGRAM_BIN_KEYS = tuple(
+    (f'histogram_bin_{i}', f'histogram_bin_{i}_live', f'histogram_bin_{i}_harvest')
+    for i in range(16)
+)
+
+
+def _histogram_keys(bin_index: int) -> Tuple[str, str, str]:
+    """Return the (total, live, harvest) output keys for a histogram bin."""
+    if 0 <= bin_index < len(_HISTOGRAM_BIN_KEYS):
+        return _HISTOGRAM_BIN_KEYS[bin_index]
+    return (f'histogram_bin_{bin_index}', f'histogram_bin_{bin_index}_live',
+            f'histogram_bin_{bin_index}_harvest')
+
+
+def _child_text(children: Dict[str, Any], tag: str) -> Optional[str]:
+    """Return the text of an element in a {tag: element} map, or None."""
+    child = children.get(tag)
+    if child is not None:
+        return child.text
+    return None
+
+
+# Unit prefix letter (before 'bps') -> bits per second multiplier
+_SPEED_MULTIPLIERS = {
+    'g': 1_000_000_000,
+    'm': 1_000_000,
+    'k': 1_000,
+}
+
+
 def parse_speed(speed_text: str) -> Optional[int]:
     """
     Parse speed string to bits per second.
@@ -72,27 +141,141 @@ def parse_speed(speed_text: str) -> Optional[int]:
         return None
     
     speed_text = speed_text.strip().lower()
+    if not speed_text.endswith('bps'):
+        return None
     
-    # Extract numeric part and unit
-    multipliers = {
-        'gbps': 1_000_000_000,
-        'mbps': 1_000_000,
-        'kbps': 1_000,
-        'bps': 1
-    }
+    # The letter before 'bps' selects the multiplier; plain 'bps' has none
+    number = speed_text[:-3]
+    multiplier = _SPEED_MULTIPLIERS.get(number[-1:])
+    if multiplier is None:
+        multiplier = 1
+    else:
+        number = number[:-1]
+    
+    try:
+        return int(float(number) * multiplier)
+    except ValueError:
+        return None
+
+
+def _parse_physical_interface(interface, device: str, timestamp: int, collection_time: str,
+                              interface_filter: Optional[FrozenSet[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Extract FEC statistics from a single <physical-interface> element.
+    
+    Args:
+        interface: physical-interface element
+        device: Device hostname or IP address
+        timestamp: Collection time as Unix epoch seconds
+        collection_time: Collection time as 'YYYY-MM-DD HH:MM:SS'
+        interface_filter: Optional set of interface names to include
+        
+    Returns:
+        Interface statistics dictionary, or None if the interface is unnamed,
+        filtered out, or carries no FEC data
+    """
+    # Basic interface information; read and filter on the name before any
+    # other work, as a filter usually selects a few of many interfaces
+    name_text = interface.findtext('{*}name')
+    if name_text:
+        interface_name = name_text.strip()
+    else:
+        return None  # Skip interfaces without a name
+    
+    # Apply interface filter if provided
+    if interface_filter is not None and interface_name not in interface_filter:
+        return None
+    
+    interface_data = {'if_name': interface_name}
+    
+    # Index children in a single pass; the FEC histogram is the one repeated
+    # element, so its entries are collected separately
+    children = {}
+    histogram = []
+    for child in interface.iterchildren(tag=etree.Element):
+        tag = child.tag.rpartition('}')[2]
+        if tag == 'ethernet-fechistogram-statistics':
+            histogram.append(child)
+        else:
+            children[tag] = child
+    
+    # Add device and timestamp
+    interface_data['device'] = device
+    interface_data['timestamp'] = timestamp
+    interface_data['collection_time'] = collection_time
+    
+    # Admin and operational status (optional, for context)
+    for out_key, tag in _STATUS_FIELDS:
+        text = _child_text(children, tag)
+        if text:
+            interface_data[out_key] = text.strip()
+    
+    # Interface speed (optional, for normalization)
+    speed = _child_text(children, 'speed')
+    if speed:
+        speed_bps = parse_speed(speed)
+        if speed_bps is not None:
+            interface_data['speed_bps'] = speed_bps
     
-    for unit, multiplier in multipliers.items():
-        if speed_text.endswith(unit):
+    # Traffic statistics (optional, for correlation with errors)
+    traffic_stats = children.get('traffic-statistics')
+    if traffic_stats is not None:
+        traffic = child_texts(traffic_stats)
+        for out_key, tag in _TRAFFIC_FIELDS:
+            text = traffic.get(tag)
+            if text:
+                interface_data[out_key] = extract_numeric_value(text)
+    
+    # === KEY METRICS FOR ML ===
+    
+    # 1-5: FEC statistics from ethernet-fec-statistics
+    fec_stats = children.get('ethernet-fec-statistics')
+    if fec_stats is not None:
+        fec = child_texts(fec_stats)
+        for out_key, tag in _FEC_FIELDS:
+            text = fec.get(tag)
+            if text:
+                interface_data[out_key] = extract_numeric_value(text)
+    
+    # 6. FEC Histogram - error distribution across bins 0-15
+    # Each bin represents number of symbol errors in a codeword
+    # Critical for understanding error patterns and predicting degradation
+    for bin_data in histogram:
+        bin_fields = child_texts(bin_data)
+        bin_num = bin_fields.get('bin-num')
+        if bin_num:
+            # Bin numbers are small integers, no float/comma handling needed
             try:
-                value = float(speed_text[:-len(unit)])
-                return int(value * multiplier)
+                bin_index = int(bin_num)
             except ValueError:
-                return None
+                bin_index = None
+            if bin_index is not None:
+                # Live errors (current/recent errors)
+                sym_live = bin_fields.get('sym-live-err')
+                live_err = 0
+                if sym_live:
+                    live_err = extract_numeric_value(sym_live) or 0
+                
+                # Harvest errors (historical cumulative errors)
+                sym_harvest = bin_fields.get('sym-harvest-err')
+                harvest_err = 0
+                if sym_harvest:
+                    harvest_err = extract_numeric_value(sym_harvest) or 0
+                
+                # Store total (live + harvest) for ML features
+                total_key, live_key, harvest_key = _histogram_keys(bin_index)
+                interface_data[total_key] = live_err + harvest_err
+                # Also store individual components for detailed analysis
+                interface_data[live_key] = live_err
+                interface_data[harvest_key] = harvest_err
     
+    # Only include interfaces with FEC data (optical interfaces)
+    if 'fec_ccw' in interface_data or 'fec_nccw' in interface_data:
+        return interface_data
     return None
 
 
-def parse_interface_statistics(xml_content: str, device: str, interface_filter: List[str] = None) -> Dict[str, Any]:
+def parse_interface_statistics(xml_content: Union[str, bytes, BinaryIO], device: str, interface_filter: List[str] = None) -> Dict[str, Any]:
     """
     Parse interface FEC statistics from Junos get-interface-information XML output.
     
@@ -105,150 +288,235 @@ def parse_interface_statistics(xml_content: str, device: str, interface_filter:
     6. FEC Histogram bins 0-15 (histogram_bin_N with live + harvest errors)
     
     Args:
-        xml_content: XML string from get-interface-information RPC
+        xml_content: XML string, bytes, or binary file object from
+            get-interface-information RPC (files are read incrementally)
         device: Device hostname or IP address
         interface_filter: Optional list of interface names to include
         
     Returns:
         Dictionary with 'interfaces' key containing list of interface statistics
     """
+    if isinstance(xml_content, str):
+        xml_content = xml_content.encode('utf-8')
+    source = xml_content if hasattr(xml_content, 'read') else io.BytesIO(xml_content)
+    
+    results = []
+    filter_set = frozenset(interface_filter) if interface_filter is not None else None
+    
+    # Every interface in one reply shares the same collection instant
+    timestamp = int(time.time())
+    collection_time = time.strftime('%Y-%m-%d %H:%M:%S')
+    
+    # Stream the reply: each physical-interface is handled on its end event and
+    # then released, so memory stays bounded by one interface rather than the
+    # whole document
     try:
-        root = ET.fromstring(xml_content)
-    except ET.ParseError as e:
+        for _, interface in etree.iterparse(source, events=('end',),
+                                            tag='{*}physical-interface',
+                                            remove_blank_text=True, remove_comments=True,
+                                            huge_tree=True):
+            interface_data = _parse_physical_interface(interface, device, timestamp,
+                                                       collection_time, filter_set)
+            if interface_data is not None:
+                results.append(interface_data)
+            
+            interface.clear(keep_tail=False)
+            while interface.getprevious() is not None:
+                del interface.getparent()[0]
+    except etree.XMLSyntaxError as e:
         print(f"Error parsing XML: {e}", file=sys.stderr)
         return {'interfaces': []}
     
-    # Remove namespaces for easier parsing
-    # Strip namespace from all tags
-    for elem in root.iter():
-        if '}' in elem.tag:
-            elem.tag = elem.tag.split('}', 1)[1]
-    
-    # Find all physical interfaces
-    interfaces = root.findall('.//physical-interface')
+    return {'interfaces': results}
+
+
+# Parquet schema: (column, Arrow type name) for every field the parser can
+# emit, in column order. Codeword counters are whole numbers, rates and BER
+# fit comfortably in single precision, and string columns that repeat per
+# device or reply are dictionary-encoded.
+_PARQUET_FIELDS = (
+    ('if_name', 'string'),
+    ('device', 'dictionary'),
+    ('timestamp', 'int64'),
+    ('collection_time', 'dictionary'),
+    ('admin_status', 'dictionary'),
+    ('oper_status', 'dictionary'),
+    ('speed_bps', 'int64'),
+    *((out_key, 'float64') for out_key, _ in _TRAFFIC_FIELDS),
+    ('fec_ccw', 'uint64'),
+    ('fec_nccw', 'uint64'),
+    ('fec_ccw_error_rate', 'float32'),
+    ('fec_nccw_error_rate', 'float32'),
+    ('pre_fec_ber', 'float32'),
+    *((key, 'float64') for keys in _HISTOGRAM_BIN_KEYS for key in keys),
+)
+
+
+def _parquet_schema(interfaces: List[Dict[str, Any]]):
+    """
+    Build the Arrow schema for a list of interface statistics records.
     
-    results = []
+    Every known field is a column even when no record carries it, so the
+    files of all devices and runs share one schema. Keys outside the known
+    fields (histogram bins above 15) are appended as float64 columns in the
+    order they are first seen.
     
-    for interface in interfaces:
-        interface_data = {}
-        
-        # Basic interface information
-        name_elem = interface.find('name')
-        if name_elem is not None and name_elem.text:
-            interface_name = name_elem.text.strip()
-            interface_data['if_name'] = interface_name
-        else:
-            continue  # Skip interfaces without a name
-        
-        # Apply interface filter if provided
-        if interface_filter is not None and interface_name not in interface_filter:
-            continue
-        
-        # Add device and timestamp
-        interface_data['device'] = device
-        interface_data['timestamp'] = int(time.time())
-        interface_data['collection_time'] = time.strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Admin and operational status (optional, for context)
-        admin_status = interface.find('admin-status')
-        if admin_status is not None and admin_status.text:
-            interface_data['admin_status'] = admin_status.text.strip()
-        
-        oper_status = interface.find('oper-status')
-        if oper_status is not None and oper_status.text:
-            interface_data['oper_status'] = oper_status.text.strip()
-        
-        # Interface speed (optional, for normalization)
-        speed = interface.find('speed')
-        if speed is not None and speed.text:
-            speed_bps = parse_speed(speed.text)
-            if speed_bps is not None:
-                interface_data['speed_bps'] = speed_bps
+    Args:
+        interfaces: Interface statistics records from parse_interface_statistics()
         
-        # Traffic statistics (optional, for correlation with errors)
-        traffic_stats = interface.find('traffic-statistics')
-        if traffic_stats is not None:
-            input_bps = traffic_stats.find('input-bps')
-            if input_bps is not None and input_bps.text:
-                interface_data['input_bps'] = extract_numeric_value(input_bps.text)
-            
-            input_pps = traffic_stats.find('input-pps')
-            if input_pps is not None and input_pps.text:
-                interface_data['input_pps'] = extract_numeric_value(input_pps.text)
-            
-            output_bps = traffic_stats.find('output-bps')
-            if output_bps is not None and output_bps.text:
-                interface_data['output_bps'] = extract_numeric_value(output_bps.text)
-            
-            output_pps = traffic_stats.find('output-pps')
-            if output_pps is not None and output_pps.text:
-                interface_data['output_pps'] = extract_numeric_value(output_pps.text)
+    Returns:
+        pyarrow.Schema
         
-        # === KEY METRICS FOR ML ===
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+    
+    arrow_types = {
+        'string': pa.string(),
+        'dictionary': pa.dictionary(pa.int32(), pa.string()),
+        'int64': pa.int64(),
+        'uint64': pa.uint64(),
+        'float32': pa.float32(),
+        'float64': pa.float64(),
+    }
+    fields = [pa.field(name, arrow_types[type_name]) for name, type_name in _PARQUET_FIELDS]
+    
+    known = {name for name, _ in _PARQUET_FIELDS}
+    for interface in interfaces:
+        for key in interface:
+            if key not in known:
+                known.add(key)
+                fields.append(pa.field(key, pa.float64()))
+    
+    return pa.schema(fields)
+
+
+def write_parquet(path: str, interfaces: List[Dict[str, Any]]) -> None:
+    """
+    Write interface statistics records to a zstd-compressed Parquet file.
+    
+    Args:
+        path: Output file path
+        interfaces: Interface statistics records from parse_interface_statistics()
         
-        # 1-5: FEC statistics from ethernet-fec-statistics
-        fec_stats = interface.find('ethernet-fec-statistics')
-        if fec_stats is not None:
-            # 1. FEC Corrected Codewords (cumulative counter)
-            fec_ccw = fec_stats.find('fec_ccw_count')
-            if fec_ccw is not None and fec_ccw.text:
-                interface_data['fec_ccw'] = extract_numeric_value(fec_ccw.text)
-            
-            # 2. FEC Uncorrected Codewords (cumulative counter) - TARGET VARIABLE
-            fec_nccw = fec_stats.find('fec_nccw_count')
-            if fec_nccw is not None and fec_nccw.text:
-                interface_data['fec_nccw'] = extract_numeric_value(fec_nccw.text)
-            
-            # 3. FEC Corrected Error Rate
-            fec_ccw_rate = fec_stats.find('fec_ccw_error_rate')
-            if fec_ccw_rate is not None and fec_ccw_rate.text:
-                interface_data['fec_ccw_error_rate'] = extract_numeric_value(fec_ccw_rate.text)
-            
-            # 4. FEC Uncorrected Error Rate
-            fec_nccw_rate = fec_stats.find('fec_nccw_error_rate')
-            if fec_nccw_rate is not None and fec_nccw_rate.text:
-                interface_data['fec_nccw_error_rate'] = extract_numeric_value(fec_nccw_rate.text)
-            
-            # 5. Pre-FEC BER (Bit Error Rate) in scientific notation
-            pre_fec_ber = fec_stats.find('pre-fec-ber')
-            if pre_fec_ber is not None and pre_fec_ber.text:
-                interface_data['pre_fec_ber'] = extract_numeric_value(pre_fec_ber.text)
+    Raises:
+        ImportError: If pyarrow is not installed
+        IOError: If the file cannot be written
+        ValueError: If a value does not fit its column type (pyarrow's
+            ArrowInvalid, e.g. a negative codeword count)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    # An explicit schema keeps columns that the first record lacks; inferred
+    # from the records, the columns would come from the first record only
+    table = pa.Table.from_pylist(interfaces, schema=_parquet_schema(interfaces))
+    pq.write_table(table, path, compression='zstd')
+
+
+def write_output(path: str, result: Dict[str, Any], output_format: str = 'json') -> None:
+    """
+    Write a parse_interface_statistics() result in the requested format.
+    
+    Args:
+        path: Output file path
+        result: Parser result with an 'interfaces' list
+        output_format: 'json' (indented document), 'ndjson' (one interface
+            per line) or 'parquet' (one row per interface)
+    """
+    if output_format == 'ndjson':
+        write_ndjson(path, result['interfaces'])
+    elif output_format == 'parquet':
+        write_parquet(path, result['interfaces'])
+    else:
+        write_json(path, result)
+
+
+def _parse_one(spec: Tuple[str, str], interface_filter: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Read and parse one (path, device) spec; module-level so worker processes can run it."""
+    path, device = spec
+    with open(path, 'rb') as f:
+        return parse_interface_statistics(f, device, interface_filter)
+
+
+def parse_many(specs: List[Tuple[str, str]], interface_filter: Optional[List[str]] = None,
+               workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Parse many get-interface-information replies in parallel.
+    
+    Files are spread over a process pool so each worker imports lxml once and
+    then parses a run of files.
+    
+    Args:
+        specs: List of (XML file path, device) tuples
+        interface_filter: Optional list of interface names to include
+        workers: Number of worker processes (defaults to CPU count)
         
-        # 6. FEC Histogram - error distribution across bins 0-15
-        # Each bin represents number of symbol errors in a codeword
-        # Critical for understanding error patterns and predicting degradation
-        fec_histogram = interface.findall('ethernet-fechistogram-statistics')
-        if fec_histogram:
-            for bin_data in fec_histogram:
-                bin_num = bin_data.find('bin-num')
-                if bin_num is not None and bin_num.text:
-                    bin_index = extract_numeric_value(bin_num.text)
-                    if bin_index is not None:
-                        bin_index = int(bin_index)
-                        
-                        # Live errors (current/recent errors)
-                        sym_live = bin_data.find('sym-live-err')
-                        live_err = 0
-                        if sym_live is not None and sym_live.text:
-                            live_err = extract_numeric_value(sym_live.text) or 0
-                        
-                        # Harvest errors (historical cumulative errors)
-                        sym_harvest = bin_data.find('sym-harvest-err')
-                        harvest_err = 0
-                        if sym_harvest is not None and sym_harvest.text:
-                            harvest_err = extract_numeric_value(sym_harvest.text) or 0
-                        
-                        # Store total (live + harvest) for ML features
-                        interface_data[f'histogram_bin_{bin_index}'] = live_err + harvest_err
-                        # Also store individual components for detailed analysis
-                        interface_data[f'histogram_bin_{bin_index}_live'] = live_err
-                        interface_data[f'histogram_bin_{bin_index}_harvest'] = harvest_err
+    Returns:
+        One parse_interface_statistics() result per spec, in input order
+    """
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        return list(pool.map(_parse_one, specs, repeat(interface_filter), chunksize=4))
+
+
+def read_batch_manifest(manifest_path: str) -> List[Tuple[str, str, str]]:
+    """
+    Read a batch manifest of (input, output, device) triples.
+    
+    Each non-empty line holds whitespace-separated input XML path, output JSON
+    path and device name. Lines starting with '#' are ignored.
+    
+    Args:
+        manifest_path: Path to the manifest file
         
-        # Only include interfaces with FEC data (optical interfaces)
-        if 'fec_ccw' in interface_data or 'fec_nccw' in interface_data:
-            results.append(interface_data)
+    Returns:
+        List of (input_path, output_path, device) tuples
+    """
+    entries = []
+    with open(manifest_path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = line.split()
+            if len(fields) != 3:
+                raise ValueError(f"{manifest_path}:{line_number}: expected 'input output device'")
+            entries.append(tuple(fields))
+    return entries
+
+
+def run_batch_manifest(manifest_path: str, interface_filter: Optional[List[str]] = None,
+                       workers: Optional[int] = None, output_format: str = 'json') -> None:
+    """
+    Parse every file listed in a batch manifest and write each JSON output.
     
-    return {'interfaces': results}
+    Args:
+        manifest_path: Path to the manifest file (see read_batch_manifest)
+        interface_filter: Optional list of interface names to include
+        workers: Number of worker processes (defaults to CPU count)
+        output_format: Output format passed to write_output()
+    """
+    try:
+        entries = read_batch_manifest(manifest_path)
+    except (IOError, ValueError) as e:
+        print(f"Error reading batch manifest {manifest_path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    try:
+        results = parse_many([(input_path, device) for input_path, _, device in entries],
+                             interface_filter, workers)
+    except IOError as e:
+        print(f"Error reading input file: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    for (_, output_path, device), result in zip(entries, results):
+        try:
+            write_output(output_path, result, output_format)
+        except (IOError, ImportError, ValueError) as e:
+            print(f"Error writing output file {output_path}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"{device}: extracted FEC statistics for {len(result['interfaces'])} interface(s)")
 
 
 def main():
@@ -256,31 +524,42 @@ def main():
     parser = argparse.ArgumentParser(
         description='Parse Junos interface FEC statistics for ML training'
     )
-    parser.add_argument('--input', required=True, help='Input XML file from get-interface-information RPC')
-    parser.add_argument('--output', required=True, help='Output JSON file for FEC statistics')
-    parser.add_argument('--device', required=True, help='Device hostname or IP address')
+    parser.add_argument('--input', help='Input XML file from get-interface-information RPC')
+    parser.add_argument('--output', help='Output JSON file for FEC statistics')
+    parser.add_argument('--device', help='Device hostname or IP address')
+    parser.add_argument('--batch-manifest',
+                       help='File listing "input output device" per line; parsed in parallel instead of --input')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for --batch-manifest (default: CPU count)')
     parser.add_argument('--interfaces', type=str, 
                        help='Comma-separated list of interface names to filter (e.g., "et-0/0/0,et-0/0/1")')
+    parser.add_argument('--format', default='json', choices=['json', 'ndjson', 'parquet'],
+                       help='Output format: indented JSON (default), one interface per line, or Parquet')
     
     args = parser.parse_args()
     
+    if not args.batch_manifest and not (args.input and args.output and args.device):
+        parser.error('--input, --output and --device are required unless --batch-manifest is given')
+    
     # Parse interface filter if provided
     interface_filter = None
     if args.interfaces:
         interface_filter = [iface.strip() for iface in args.interfaces.split(',')]
         print(f"Filtering for interfaces: {', '.join(interface_filter)}")
     
-    # Read input XML
+    if args.batch_manifest:
+        run_batch_manifest(args.batch_manifest, interface_filter, args.workers, args.format)
+        return
+    
+    # Parse interface statistics straight from the file; lxml reads it in
+    # chunks, so the whole document is never held as one string
     try:
-        with open(args.input, 'r') as f:
-            xml_content = f.read()
+        with open(args.input, 'rb') as f:
+            result = parse_interface_statistics(f, args.device, interface_filter)
     except IOError as e:
         print(f"Error reading input file {args.input}: {e}", file=sys.stderr)
         sys.exit(1)
     
-    # Parse interface statistics
-    result = parse_interface_statistics(xml_content, args.device, interface_filter)
-    
     interface_count = len(result['interfaces'])
     
     if interface_count == 0:
@@ -307,12 +586,11 @@ def main():
             if metrics_found:
                 print(f"Metrics collected: {', '.join(metrics_found)}")
     
-    # Write output JSON
+    # Write output
     try:
-        with open(args.output, 'w') as f:
-            json.dump(result, f, indent=2)
+        write_output(args.output, result, args.format)
         print(f"Output written to {args.output}")
-    except IOError as e:
+    except (IOError, ImportError, ValueError) as e:
         print(f"Error writing output file {args.output}: {e}", file=sys.stderr)
         sys.exit(1)
 
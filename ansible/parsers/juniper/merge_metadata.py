@@ -9,12 +9,57 @@ import argparse
 import json
 import sys
 from typing import Dict, Optional
-import os
 
 # Add parent directory to path for imports
 # sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from parsers.common.interface_mapping import parse_interface_base_name
+from parsers.common.json_utils import read_json, write_json
+
+
+# Transceiver fields copied from PIC detail, in output order
+_PIC_TRANSCEIVER_FIELDS = (
+    'vendor', 'part_number', 'serial_number', 'cable_type',
+    'media_type', 'wavelength', 'fiber_type', 'firmware_version',
+)
+
+
+def _apply_metadata(record: Dict, base_if_name: Optional[str], device_meta: tuple,
+                    transceivers: Dict, pic_transceivers: Dict) -> None:
+    """
+    Add device and transceiver metadata to one interface or lane record in place.
+    
+    Args:
+        record: Interface or lane metrics record
+        base_if_name: Interface name without channel suffix, or None
+        device_meta: (key, value) pairs of device-level metadata to set
+        transceivers: Chassis inventory transceivers keyed by interface name,
+            as JSON dicts or in-memory TransceiverInfo records
+        pic_transceivers: PIC detail transceivers keyed by interface name,
+            as JSON dicts or in-memory Transceiver records
+    """
+    # Add device-level metadata
+    for key, value in device_meta:
+        record[key] = value
+    
+    if not base_if_name:
+        return
+    
+    # Merge transceiver metadata from PIC detail and chassis inventory
+    # PIC detail has vendor, part_number, etc. but not serial_number
+    # Chassis inventory has serial_number
+    pic_data = pic_transceivers.get(base_if_name)
+    if pic_data is not None:
+        for key in _PIC_TRANSCEIVER_FIELDS:
+            value = pic_data.get(key)
+            if value:
+                record[key] = value
+    
+    # Get serial_number from chassis inventory if not already set
+    if 'serial_number' not in record and base_if_name in transceivers:
+        serial_number = transceivers[base_if_name].get('serial_number')
+        if serial_number:
+            record['serial_number'] = serial_number
 
 
 def merge_metadata(system_info: Dict, chassis_inv: Dict, optics_metrics: Dict, pic_detail: Optional[Dict] = None) -> Dict:
@@ -40,100 +85,30 @@ def merge_metadata(system_info: Dict, chassis_inv: Dict, optics_metrics: Dict, p
     # Get PIC detail transceivers (higher priority for vendor info)
     pic_transceivers = pic_detail.get('transceivers', {}) if pic_detail else {}
     
-    # Update interface metrics
-    for interface in optics_metrics.get('interfaces', []):
-        if_name = interface.get('if_name')
-        
-        # Add device-level metadata
-        if origin_hostname:
-            interface['origin_hostname'] = origin_hostname
-        if device_profile:
-            interface['device_profile'] = device_profile
-        if origin_name:
-            interface['origin_name'] = origin_name
-        if inventory_instance:
-            interface['inventory_instance'] = inventory_instance
+    # Device-level metadata is identical for every record; keep only the set values
+    device_meta = tuple(
+        (key, value) for key, value in (
+            ('origin_hostname', origin_hostname),
+            ('device_profile', device_profile),
+            ('origin_name', origin_name),
+            ('inventory_instance', inventory_instance),
+        ) if value
+    )
+    
+    # Lanes repeat their interface name, so resolve each base name only once
+    base_names = {}
+    
+    for record in (*optics_metrics.get('interfaces', []), *optics_metrics.get('lanes', [])):
+        if_name = record.get('if_name')
         
-        # Add transceiver metadata
         # Extract base interface name (remove :N suffix for channelized interfaces)
-        base_if_name = parse_interface_base_name(if_name) if if_name else None
-        
-        if base_if_name:
-            # Merge transceiver metadata from PIC detail and chassis inventory
-            # PIC detail has vendor, part_number, etc. but not serial_number
-            # Chassis inventory has serial_number
-            if base_if_name in pic_transceivers:
-                pic_data = pic_transceivers[base_if_name]
-                # All transceiver metadata from PIC detail
-                if pic_data.get('vendor'):
-                    interface['vendor'] = pic_data['vendor']
-                if pic_data.get('part_number'):
-                    interface['part_number'] = pic_data['part_number']
-                if pic_data.get('serial_number'):
-                    interface['serial_number'] = pic_data['serial_number']
-                if pic_data.get('cable_type'):
-                    interface['cable_type'] = pic_data['cable_type']
-                if pic_data.get('media_type'):
-                    interface['media_type'] = pic_data['media_type']
-                if pic_data.get('wavelength'):
-                    interface['wavelength'] = pic_data['wavelength']
-                if pic_data.get('fiber_type'):
-                    interface['fiber_type'] = pic_data['fiber_type']
-                if pic_data.get('firmware_version'):
-                    interface['firmware_version'] = pic_data['firmware_version']
-            
-            # Get serial_number from chassis inventory if not already set
-            if 'serial_number' not in interface and base_if_name in transceivers:
-                chassis_data = transceivers[base_if_name]
-                if chassis_data.get('serial_number'):
-                    interface['serial_number'] = chassis_data['serial_number']
-    
-    # Update lane metrics
-    for lane in optics_metrics.get('lanes', []):
-        if_name = lane.get('if_name')
-        
-        # Add device-level metadata
-        if origin_hostname:
-            lane['origin_hostname'] = origin_hostname
-        if device_profile:
-            lane['device_profile'] = device_profile
-        if origin_name:
-            lane['origin_name'] = origin_name
-        if inventory_instance:
-            lane['inventory_instance'] = inventory_instance
-        
-        # Add transceiver metadata
-        base_if_name = parse_interface_base_name(if_name) if if_name else None
+        base_if_name = None
+        if if_name:
+            base_if_name = base_names.get(if_name)
+            if base_if_name is None:
+                base_if_name = base_names[if_name] = parse_interface_base_name(if_name)
         
-        if base_if_name:
-            # Merge transceiver metadata from PIC detail and chassis inventory
-            # PIC detail has vendor, part_number, etc. but not serial_number
-            # Chassis inventory has serial_number
-            if base_if_name in pic_transceivers:
-                pic_data = pic_transceivers[base_if_name]
-                # All transceiver metadata from PIC detail
-                if pic_data.get('vendor'):
-                    lane['vendor'] = pic_data['vendor']
-                if pic_data.get('part_number'):
-                    lane['part_number'] = pic_data['part_number']
-                if pic_data.get('serial_number'):
-                    lane['serial_number'] = pic_data['serial_number']
-                if pic_data.get('cable_type'):
-                    lane['cable_type'] = pic_data['cable_type']
-                if pic_data.get('media_type'):
-                    lane['media_type'] = pic_data['media_type']
-                if pic_data.get('wavelength'):
-                    lane['wavelength'] = pic_data['wavelength']
-                if pic_data.get('fiber_type'):
-                    lane['fiber_type'] = pic_data['fiber_type']
-                if pic_data.get('firmware_version'):
-                    lane['firmware_version'] = pic_data['firmware_version']
-            
-            # Get serial_number from chassis inventory if not already set
-            if 'serial_number' not in lane and base_if_name in transceivers:
-                chassis_data = transceivers[base_if_name]
-                if chassis_data.get('serial_number'):
-                    lane['serial_number'] = chassis_data['serial_number']
+        _apply_metadata(record, base_if_name, device_meta, transceivers, pic_transceivers)
     
     return optics_metrics
 
@@ -152,16 +127,14 @@ def main():
     
     # Load system information
     try:
-        with open(args.system_info, 'r') as f:
-            system_info = json.load(f)
+        system_info = read_json(args.system_info)
     except (IOError, json.JSONDecodeError) as e:
         print(f"Warning: Error loading system information: {e}", file=sys.stderr)
         system_info = {}
     
     # Load chassis inventory
     try:
-        with open(args.chassis_inventory, 'r') as f:
-            chassis_inv = json.load(f)
+        chassis_inv = read_json(args.chassis_inventory)
     except (IOError, json.JSONDecodeError) as e:
         print(f"Warning: Error loading chassis inventory: {e}", file=sys.stderr)
         chassis_inv = {}
@@ -170,16 +143,14 @@ def main():
     pic_detail = None
     if args.pic_detail:
         try:
-            with open(args.pic_detail, 'r') as f:
-                pic_detail = json.load(f)
+            pic_detail = read_json(args.pic_detail)
         except (IOError, json.JSONDecodeError) as e:
             print(f"Warning: Error loading PIC detail: {e}", file=sys.stderr)
             pic_detail = None
     
     # Load optics metrics
     try:
-        with open(args.optics_metrics, 'r') as f:
-            optics_metrics = json.load(f)
+        optics_metrics = read_json(args.optics_metrics)
     except (IOError, json.JSONDecodeError) as e:
         print(f"Error loading optics metrics: {e}", file=sys.stderr)
         sys.exit(1)
@@ -189,8 +160,7 @@ def main():
     
     # Write output
     try:
-        with open(args.output, 'w') as f:
-            json.dump(merged_metrics, f, indent=2)
+        write_json(args.output, merged_metrics)
         
         interface_count = len(merged_metrics.get('interfaces', []))
         lane_count = len(merged_metrics.get('lanes', []))
@@ -5,16 +5,70 @@ Converts optical interface metrics to JSON format.
 """
 
 import argparse
-import xml.etree.ElementTree as ET
+import io
 import sys
 import json
 import time
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+from lxml import etree
+
+from parsers.common.json_utils import write_json, write_ndjson
+from parsers.common.xml_utils import child_texts
+
+
+# (output key, optics-diagnostics tag) for interface-level alarm and warning
+# thresholds, in output order
+_THRESHOLD_FIELDS = (
+    ('temperature_high_alarm', 'module-temperature-high-alarm-threshold'),
+    ('temperature_low_alarm', 'module-temperature-low-alarm-threshold'),
+    ('temperature_high_warn', 'module-temperature-high-warn-threshold'),
+    ('temperature_low_warn', 'module-temperature-low-warn-threshold'),
+    ('voltage_high_alarm', 'module-voltage-high-alarm-threshold'),
+    ('voltage_low_alarm', 'module-voltage-low-alarm-threshold'),
+    ('voltage_high_warn', 'module-voltage-high-warn-threshold'),
+    ('voltage_low_warn', 'module-voltage-low-warn-threshold'),
+    ('tx_power_high_alarm', 'laser-tx-power-high-alarm-threshold-dbm'),
+    ('tx_power_low_alarm', 'laser-tx-power-low-alarm-threshold-dbm'),
+    ('tx_power_high_warn', 'laser-tx-power-high-warn-threshold-dbm'),
+    ('tx_power_low_warn', 'laser-tx-power-low-warn-threshold-dbm'),
+    ('rx_power_high_alarm', 'laser-rx-power-high-alarm-threshold-dbm'),
+    ('rx_power_low_alarm', 'laser-rx-power-low-alarm-threshold-dbm'),
+    ('rx_power_high_warn', 'laser-rx-power-high-warn-threshold-dbm'),
+    ('rx_power_low_warn', 'laser-rx-power-low-warn-threshold-dbm'),
+    ('tx_bias_high_alarm', 'laser-bias-current-high-alarm-threshold'),
+    ('tx_bias_low_alarm', 'laser-bias-current-low-alarm-threshold'),
+    ('tx_bias_high_warn', 'laser-bias-current-high-warn-threshold'),
+    ('tx_bias_low_warn', 'laser-bias-current-low-warn-threshold'),
+)
+
+# Measured values reported directly on interfaces without lanes
+_INTERFACE_DOM_FIELDS = (
+    ('voltage', 'module-voltage'),
+    ('tx_bias', 'laser-bias-current'),
+    ('tx_power_mw', 'laser-output-power'),
+    ('tx_power', 'laser-output-power-dbm'),
+)
+
+# RX power is reported under either name depending on the optic
+_INTERFACE_RX_FIELDS = (
+    ('rx_power_mw', 'laser-rx-optical-power', 'rx-signal-avg-optical-power'),
+    ('rx_power', 'laser-rx-optical-power-dbm', 'rx-signal-avg-optical-power-dbm'),
+)
+
+# (output key, lane tag) for per-lane measurements, in output order
+_LANE_FIELDS = (
+    ('rx_power_mw', 'laser-rx-optical-power'),
+    ('rx_power', 'laser-rx-optical-power-dbm'),
+    ('tx_power_mw', 'laser-output-power'),
+    ('tx_power', 'laser-output-power-dbm'),
+    ('tx_bias', 'laser-bias-current'),
+)
 
 
 def strip_namespace(tag):
     """Remove namespace from XML tag."""
-    return tag.split('}', 1)[1] if '}' in tag else tag
+    # rpartition returns the whole tag when there is no namespace
+    return tag.rpartition('}')[2]
 
 
 def findall_ns(element, tag):
@@ -34,19 +88,15 @@ def findtext_ns(element, tag, default=None):
     return child.text if child is not None and child.text else default
 
 
-def findall_recursive_ns(element, tag):
-    """Find all descendant elements with tag, ignoring namespace."""
-    results = []
-    for child in element.iter():
-        if strip_namespace(child.tag) == tag:
-            results.append(child)
-    return results
-
-
 def extract_numeric_value(text: Optional[str]) -> Optional[float]:
     """Extract numeric value from text, handling units."""
     if not text:
         return None
+    # Bare numbers are the common case; only split off units when needed
+    try:
+        return float(text)
+    except (ValueError, TypeError):
+        pass
     try:
         # Split on space and take the first part
         value = text.split()[0]
@@ -55,7 +105,21 @@ def extract_numeric_value(text: Optional[str]) -> Optional[float]:
         return None
 
 
-def parse_interface_metrics(phys_interface: ET.Element, device: str, 
+def _available_diagnostics(phys_interface):
+    """Return the optics-diagnostics element of an interface, or None if the optic reports none."""
+    optics_diag = find_ns(phys_interface, 'optics-diagnostics')
+    
+    if optics_diag is None:
+        return None
+    
+    # Check if diagnostics are not available
+    if find_ns(optics_diag, 'optic-diagnostics-not-available') is not None:
+        return None
+    
+    return optics_diag
+
+
+def parse_interface_metrics(phys_interface, device: str, 
                             additional_metadata: Dict = None) -> Optional[Dict]:
     """
     Parse interface-level metrics (thresholds).
@@ -68,15 +132,19 @@ def parse_interface_metrics(phys_interface: ET.Element, device: str,
     Returns:
         Dictionary with interface metrics or None if not available
     """
-    interface_name = findtext_ns(phys_interface, 'name', 'unknown')
-    optics_diag = find_ns(phys_interface, 'optics-diagnostics')
-    
+    optics_diag = _available_diagnostics(phys_interface)
     if optics_diag is None:
         return None
     
-    # Check if diagnostics are not available
-    if find_ns(optics_diag, 'optic-diagnostics-not-available') is not None:
-        return None
+    interface_name = findtext_ns(phys_interface, 'name', 'unknown')
+    return _interface_record(optics_diag, interface_name, device, additional_metadata)
+
+
+def _interface_record(optics_diag, interface_name: str, device: str,
+                      additional_metadata: Dict = None) -> Dict:
+    """Build the interface-level record from an available optics-diagnostics element."""
+    # Read every field in one pass over the diagnostics children
+    fields = child_texts(optics_diag)
     
     metrics = {
         'if_name': interface_name,
@@ -84,59 +152,13 @@ def parse_interface_metrics(phys_interface: ET.Element, device: str,
         'timestamp': int(time.time() * 1000000)  # microseconds
     }
     
-    # Temperature thresholds
-    metrics['temperature_high_alarm'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'module-temperature-high-alarm-threshold'))
-    metrics['temperature_low_alarm'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'module-temperature-low-alarm-threshold'))
-    metrics['temperature_high_warn'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'module-temperature-high-warn-threshold'))
-    metrics['temperature_low_warn'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'module-temperature-low-warn-threshold'))
-    
-    # Voltage thresholds
-    metrics['voltage_high_alarm'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'module-voltage-high-alarm-threshold'))
-    metrics['voltage_low_alarm'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'module-voltage-low-alarm-threshold'))
-    metrics['voltage_high_warn'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'module-voltage-high-warn-threshold'))
-    metrics['voltage_low_warn'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'module-voltage-low-warn-threshold'))
-    
-    # TX power thresholds
-    metrics['tx_power_high_alarm'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-tx-power-high-alarm-threshold-dbm'))
-    metrics['tx_power_low_alarm'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-tx-power-low-alarm-threshold-dbm'))
-    metrics['tx_power_high_warn'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-tx-power-high-warn-threshold-dbm'))
-    metrics['tx_power_low_warn'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-tx-power-low-warn-threshold-dbm'))
-    
-    # RX power thresholds
-    metrics['rx_power_high_alarm'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-rx-power-high-alarm-threshold-dbm'))
-    metrics['rx_power_low_alarm'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-rx-power-low-alarm-threshold-dbm'))
-    metrics['rx_power_high_warn'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-rx-power-high-warn-threshold-dbm'))
-    metrics['rx_power_low_warn'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-rx-power-low-warn-threshold-dbm'))
-    
-    # TX bias current thresholds
-    metrics['tx_bias_high_alarm'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-bias-current-high-alarm-threshold'))
-    metrics['tx_bias_low_alarm'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-bias-current-low-alarm-threshold'))
-    metrics['tx_bias_high_warn'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-bias-current-high-warn-threshold'))
-    metrics['tx_bias_low_warn'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-bias-current-low-warn-threshold'))
+    # Temperature, voltage, TX power, RX power and TX bias thresholds
+    for key, tag in _THRESHOLD_FIELDS:
+        metrics[key] = extract_numeric_value(fields.get(tag))
     
     # Current measured values
     # Temperature - extract from junos:celsius attribute
-    temp_element = find_ns(optics_diag, 'module-temperature')
+    temp_element = optics_diag.find('{*}module-temperature')
     if temp_element is not None:
         # Try to get from attribute first (most accurate)
         temp_celsius = temp_element.get('{http://xml.juniper.net/junos/26.2I20251216150948-vchintada-1/junos}celsius')
@@ -150,34 +172,13 @@ def parse_interface_metrics(phys_interface: ET.Element, device: str,
     else:
         metrics['temperature'] = None
     
-    # Voltage - extract from text content
-    metrics['voltage'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'module-voltage'))
-    
-    # DOM metrics for interfaces without lanes (directly at interface level)
-    # TX bias current
-    metrics['tx_bias'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-bias-current'))
+    # Voltage and DOM metrics for interfaces without lanes (directly at interface level)
+    for key, tag in _INTERFACE_DOM_FIELDS:
+        metrics[key] = extract_numeric_value(fields.get(tag))
     
-    # TX power (mW)
-    metrics['tx_power_mw'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-output-power'))
-    
-    # TX power (dBm)
-    metrics['tx_power'] = extract_numeric_value(
-        findtext_ns(optics_diag, 'laser-output-power-dbm'))
-    
-    # RX power (mW) - check both possible field names
-    rx_power_mw = findtext_ns(optics_diag, 'laser-rx-optical-power')
-    if not rx_power_mw:
-        rx_power_mw = findtext_ns(optics_diag, 'rx-signal-avg-optical-power')
-    metrics['rx_power_mw'] = extract_numeric_value(rx_power_mw)
-    
-    # RX power (dBm) - check both possible field names
-    rx_power_dbm = findtext_ns(optics_diag, 'laser-rx-optical-power-dbm')
-    if not rx_power_dbm:
-        rx_power_dbm = findtext_ns(optics_diag, 'rx-signal-avg-optical-power-dbm')
-    metrics['rx_power'] = extract_numeric_value(rx_power_dbm)
+    # RX power (mW and dBm) - check both possible field names
+    for key, tag, fallback_tag in _INTERFACE_RX_FIELDS:
+        metrics[key] = extract_numeric_value(fields.get(tag) or fields.get(fallback_tag))
     
     # Add additional metadata if provided
     if additional_metadata:
@@ -186,7 +187,7 @@ def parse_interface_metrics(phys_interface: ET.Element, device: str,
     return metrics
 
 
-def parse_lane_metrics(phys_interface: ET.Element, device: str,
+def parse_lane_metrics(phys_interface, device: str,
                        additional_metadata: Dict = None) -> List[Dict]:
     """
     Parse lane-level metrics.
@@ -199,47 +200,33 @@ def parse_lane_metrics(phys_interface: ET.Element, device: str,
     Returns:
         List of dictionaries with lane metrics
     """
-    interface_name = findtext_ns(phys_interface, 'name', 'unknown')
-    optics_diag = find_ns(phys_interface, 'optics-diagnostics')
-    
+    optics_diag = _available_diagnostics(phys_interface)
     if optics_diag is None:
         return []
     
-    # Check if diagnostics are not available
-    if find_ns(optics_diag, 'optic-diagnostics-not-available') is not None:
-        return []
-    
+    interface_name = findtext_ns(phys_interface, 'name', 'unknown')
+    return _lane_records(optics_diag, interface_name, device, additional_metadata)
+
+
+def _lane_records(optics_diag, interface_name: str, device: str,
+                  additional_metadata: Dict = None) -> List[Dict]:
+    """Build the lane-level records from an available optics-diagnostics element."""
     lane_metrics_list = []
     
-    for lane in findall_recursive_ns(optics_diag, 'optics-diagnostics-lane-values'):
-        lane_index = findtext_ns(lane, 'lane-index', '0')
+    for lane in optics_diag.iter('{*}optics-diagnostics-lane-values'):
+        # Read every lane field in one pass over its children
+        fields = child_texts(lane)
         
         metrics = {
             'if_name': interface_name,
             'device': device,
-            'lane': int(lane_index),
+            'lane': int(fields.get('lane-index') or '0'),
             'timestamp': int(time.time() * 1000000)  # microseconds
         }
         
-        # RX power (mW)
-        metrics['rx_power_mw'] = extract_numeric_value(
-            findtext_ns(lane, 'laser-rx-optical-power'))
-        
-        # RX power (dBm)
-        metrics['rx_power'] = extract_numeric_value(
-            findtext_ns(lane, 'laser-rx-optical-power-dbm'))
-        
-        # TX power (mW)
-        metrics['tx_power_mw'] = extract_numeric_value(
-            findtext_ns(lane, 'laser-output-power'))
-        
-        # TX power (dBm)
-        metrics['tx_power'] = extract_numeric_value(
-            findtext_ns(lane, 'laser-output-power-dbm'))
-        
-        # TX bias current
-        metrics['tx_bias'] = extract_numeric_value(
-            findtext_ns(lane, 'laser-bias-current'))
+        # RX power, TX power and TX bias
+        for key, tag in _LANE_FIELDS:
+            metrics[key] = extract_numeric_value(fields.get(tag))
         
         # Add additional metadata if provided
         if additional_metadata:
@@ -250,14 +237,40 @@ def parse_lane_metrics(phys_interface: ET.Element, device: str,
     return lane_metrics_list
 
 
-def parse_optical_diagnostics(xml_content: str, device: str,
+def _parse_physical_interface(phys_interface, interface_name: str, device: str,
+                              additional_metadata: Dict = None) -> Tuple[Optional[Dict], List[Dict]]:
+    """
+    Parse interface-level and lane-level metrics of one physical interface.
+    
+    The optics-diagnostics element is located and checked once and shared by
+    both record builders, instead of once per parse_*_metrics() call.
+    
+    Args:
+        phys_interface: physical-interface XML element
+        interface_name: Interface name already read from the element
+        device: Device hostname/IP
+        additional_metadata: Additional metadata to include in output
+    
+    Returns:
+        Tuple of (interface metrics or None, list of lane metrics)
+    """
+    optics_diag = _available_diagnostics(phys_interface)
+    if optics_diag is None:
+        return None, []
+    
+    return (_interface_record(optics_diag, interface_name, device, additional_metadata),
+            _lane_records(optics_diag, interface_name, device, additional_metadata))
+
+
+def parse_optical_diagnostics(xml_content: Union[str, bytes, BinaryIO], device: str,
                               additional_metadata: Dict = None,
                               interface_filter: List[str] = None) -> Dict:
     """
     Parse optical diagnostics XML and convert to JSON format.
     
     Args:
-        xml_content: XML string from RPC response
+        xml_content: XML string, bytes, or binary file object from RPC response
+            (files are read incrementally)
         device: Device hostname/IP
         additional_metadata: Additional metadata to include in output
         interface_filter: Optional list of interface names to include. If None, all interfaces are processed.
@@ -265,31 +278,39 @@ def parse_optical_diagnostics(xml_content: str, device: str,
     Returns:
         Dictionary with 'interfaces' and 'lanes' arrays
     """
-    try:
-        root = ET.fromstring(xml_content)
-    except ET.ParseError as e:
-        print(f"Error parsing XML: {e}", file=sys.stderr)
-        return {'interfaces': [], 'lanes': []}
+    if isinstance(xml_content, str):
+        xml_content = xml_content.encode('utf-8')
+    source = xml_content if hasattr(xml_content, 'read') else io.BytesIO(xml_content)
     
     interface_metrics = []
     lane_metrics = []
+    filter_set = frozenset(interface_filter) if interface_filter is not None else None
     
-    # Find all physical interfaces (namespace-agnostic)
-    for phys_interface in findall_recursive_ns(root, 'physical-interface'):
-        interface_name = findtext_ns(phys_interface, 'name', 'unknown')
-        
-        # Apply interface filter if configured
-        if interface_filter is not None and interface_name not in interface_filter:
-            continue
-        
-        # Parse interface-level metrics
-        interface_data = parse_interface_metrics(phys_interface, device, additional_metadata)
-        if interface_data:
-            interface_metrics.append(interface_data)
-        
-        # Parse lane-level metrics
-        lanes_data = parse_lane_metrics(phys_interface, device, additional_metadata)
-        lane_metrics.extend(lanes_data)
+    # Stream the reply: each physical-interface is handled on its end event and
+    # then released, so memory stays bounded by one interface rather than the
+    # whole document. Dropping comments keeps every child tag a string.
+    try:
+        for _, phys_interface in etree.iterparse(source, events=('end',),
+                                                 tag='{*}physical-interface',
+                                                 remove_blank_text=True, remove_comments=True,
+                                                 remove_pis=True, huge_tree=True):
+            interface_name = phys_interface.findtext('{*}name') or 'unknown'
+            
+            # Apply interface filter if configured
+            if filter_set is None or interface_name in filter_set:
+                # Parse interface-level and lane-level metrics together
+                interface_data, lanes_data = _parse_physical_interface(
+                    phys_interface, interface_name, device, additional_metadata)
+                if interface_data:
+                    interface_metrics.append(interface_data)
+                lane_metrics.extend(lanes_data)
+            
+            phys_interface.clear(keep_tail=False)
+            while phys_interface.getprevious() is not None:
+                del phys_interface.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        print(f"Error parsing XML: {e}", file=sys.stderr)
+        return {'interfaces': [], 'lanes': []}
     
     return {
         'interfaces': interface_metrics,
@@ -297,6 +318,41 @@ def parse_optical_diagnostics(xml_content: str, device: str,
     }
 
 
+def metrics_to_columns(records: List[Dict]) -> Dict:
+    """
+    Convert interface or lane records to one NumPy column per field.
+    
+    Intended for batch consumers that compute over a metric across every
+    interface at once (e.g. counter deltas between collections) instead of
+    looking the field up in each record dict.
+    
+    Args:
+        records: The 'interfaces' or 'lanes' list from parse_optical_diagnostics()
+    
+    Returns:
+        Dictionary mapping field name to a NumPy array with one entry per
+        record. Integer fields are int64, other numeric fields float64 with
+        NaN where a record has no value, and anything else an object array.
+    """
+    # Imported lazily so the per-device parser doesn't pay the NumPy import cost
+    import numpy as np
+    
+    # Union of field names in first-seen order; metadata may differ per record
+    fields = list(dict.fromkeys(key for record in records for key in record))
+    
+    columns = {}
+    for field in fields:
+        values = [record.get(field) for record in records]
+        if all(type(value) is int for value in values):
+            columns[field] = np.array(values, dtype=np.int64)
+        elif all(value is None or type(value) in (int, float) for value in values):
+            columns[field] = np.array([np.nan if value is None else value for value in values],
+                                      dtype=np.float64)
+        else:
+            columns[field] = np.array(values, dtype=object)
+    return columns
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Parse Junos optical diagnostics to JSON format'
@@ -326,17 +382,15 @@ def main():
         interface_filter = [iface.strip() for iface in args.interfaces.split(',')]
         print(f"Filtering for interfaces: {', '.join(interface_filter)}")
     
-    # Read input XML
+    # Parse straight from the file; lxml reads it in chunks, so the whole
+    # document is never held as one string
     try:
-        with open(args.input, 'r') as f:
-            xml_content = f.read()
+        with open(args.input, 'rb') as f:
+            result = parse_optical_diagnostics(f, args.device, additional_metadata, interface_filter)
     except IOError as e:
         print(f"Error reading input file: {e}", file=sys.stderr)
         sys.exit(1)
     
-    # Parse and convert to metrics
-    result = parse_optical_diagnostics(xml_content, args.device, additional_metadata, interface_filter)
-    
     interface_count = len(result['interfaces'])
     lane_count = len(result['lanes'])
     
@@ -345,13 +399,11 @@ def main():
     
     # Write output
     try:
-        with open(args.output, 'w') as f:
-            if args.format == 'json':
-                json.dump(result, f, indent=2)
-            else:  # jsonl
-                # Write each lane metric as a separate JSON line
-                for lane_metric in result['lanes']:
-                    f.write(json.dumps(lane_metric) + '\n')
+        if args.format == 'json':
+            write_json(args.output, result)
+        else:  # jsonl
+            # Write each lane metric as a separate JSON line
+            write_ndjson(args.output, result['lanes'])
         
         print(f"Generated {interface_count} interface metrics and {lane_count} lane metrics")
     except IOError as e:
@@ -8,15 +8,72 @@ RPC: <get-pic-detail><fpc-slot>{fpc}</fpc-slot><pic-slot>{pic}</pic-slot></get-p
 """
 
 import argparse
-import xml.etree.ElementTree as ET
+import io
+import re
 import sys
-import json
-from typing import Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
 import os
 from lxml import etree as lxml_etree
 
-from parsers.common.xml_utils import strip_namespace, findtext_ns, findall_ns, findall_recursive_ns
+from parsers.common.xml_utils import child_texts
 from parsers.common.interface_mapping import parse_juniper_interface_name
+from parsers.common.fiber_detection import FIBER_TYPE_MULTI_MODE, FIBER_TYPE_SINGLE_MODE
+from parsers.common.json_utils import write_json
+
+
+# Shared libxml2 parser: whitespace-only text and ID tracking are never used
+_PARSER = lxml_etree.XMLParser(remove_blank_text=True, collect_ids=False, huge_tree=True)
+
+# Slot numbers in chassis module names: "FPC 0", "PIC 1"
+_FPC_NAME_RE = re.compile(r'FPC\s+(\d+)', re.IGNORECASE)
+_PIC_NAME_RE = re.compile(r'PIC\s+(\d+)', re.IGNORECASE)
+
+# Placeholder values Junos reports for fields an optic does not provide
+_NOT_AVAILABLE = frozenset(('n/a', 'na', 'none', ''))
+
+# (output key, port tag, placeholder values) copied when available, in output
+# order; the cable type doubles as the media type
+_PORT_FIELDS = (
+    ('vendor', 'sfp-vendor-name', _NOT_AVAILABLE),
+    ('part_number', 'sfp-vendor-pno', _NOT_AVAILABLE),
+    ('serial_number', 'sfp-vendor-sn', _NOT_AVAILABLE),
+    ('cable_type', 'cable-type', _NOT_AVAILABLE),
+    ('media_type', 'cable-type', _NOT_AVAILABLE),
+    ('wavelength', 'wavelength', _NOT_AVAILABLE),
+)
+
+# Version fields follow fiber_type; optics without firmware report 0.0
+_PORT_VERSION_FIELDS = (
+    ('firmware_version', 'sfp-vendor-fw-ver', _NOT_AVAILABLE | {'0.0'}),
+    ('juniper_version', 'sfp-jnpr-ver', _NOT_AVAILABLE),
+)
+
+
+class Transceiver:
+    """
+    PIC detail metadata for a single transceiver.
+    
+    Uses __slots__ instead of a per-transceiver dict, like the chassis
+    inventory records: a fleet's worth of PICs holds many thousands of these.
+    Fields the optic did not report stay None and are left out of to_dict().
+    """
+    __slots__ = ('vendor', 'part_number', 'serial_number', 'cable_type', 'media_type',
+                 'wavelength', 'fiber_type', 'firmware_version', 'juniper_version')
+    
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+    
+    def get(self, name: str, default=None):
+        """Return a field by name, or default if it was not reported (dict-style access)."""
+        value = getattr(self, name, None)
+        return default if value is None else value
+    
+    def to_dict(self) -> Dict:
+        """Return the JSON form of the record, omitting fields that were not reported."""
+        return {name: getattr(self, name) for name in self.__slots__
+                if getattr(self, name) is not None}
 
 
 def parse_fiber_mode(fiber_mode: Optional[str]) -> Optional[str]:
@@ -29,14 +86,17 @@ def parse_fiber_mode(fiber_mode: Optional[str]) -> Optional[str]:
     Returns:
         Standardized fiber type or None
     """
-    if not fiber_mode or fiber_mode.lower() in ['n/a', 'na', 'none', '']:
+    if not fiber_mode:
         return None
     
     fiber_mode_lower = fiber_mode.lower()
+    if fiber_mode_lower in _NOT_AVAILABLE:
+        return None
+    
     if 'multi' in fiber_mode_lower or 'mm' in fiber_mode_lower:
-        return 'FIBER_TYPE_MULTI_MODE'
+        return FIBER_TYPE_MULTI_MODE
     elif 'single' in fiber_mode_lower or 'sm' in fiber_mode_lower:
-        return 'FIBER_TYPE_SINGLE_MODE'
+        return FIBER_TYPE_SINGLE_MODE
     
     return None
 
@@ -47,7 +107,7 @@ def parse_pic_detail(xml_content, device: str, fpc: int, pic: int,
     Parse PIC detail XML and extract transceiver metadata.
     
     Args:
-        xml_content: XML string or lxml element from get-pic-detail RPC response
+        xml_content: XML string/bytes or lxml element from get-pic-detail RPC response
         device: Device hostname/IP
         fpc: FPC slot number
         pic: PIC slot number
@@ -58,25 +118,19 @@ def parse_pic_detail(xml_content, device: str, fpc: int, pic: int,
         - device: Device identifier
         - fpc: FPC slot
         - pic: PIC slot
-        - transceivers: Dict mapping interface names to detailed transceiver metadata
+        - transceivers: Dict mapping interface names to Transceiver records
+          (use to_dict() for the JSON form)
     """
     try:
-        # Convert lxml element to string if needed
-        if hasattr(xml_content, 'tag'):  # It's an lxml or ET element
-            try:
-                from lxml import etree as lxml_etree
-                if isinstance(xml_content, lxml_etree._Element):
-                    xml_content = lxml_etree.tostring(xml_content, encoding='unicode')
-            except (ImportError, AttributeError):
-                pass
-        
-        # Now parse as string
         if isinstance(xml_content, str):
-            root = ET.fromstring(xml_content)
+            xml_content = xml_content.encode('utf-8')
+        if isinstance(xml_content, bytes):
+            root = lxml_etree.fromstring(xml_content, _PARSER)
         else:
-            # Last resort, try to use it directly
+            # Already an element (e.g. a NETCONF reply); use it as-is rather
+            # than serializing and re-parsing it
             root = xml_content
-    except (ET.ParseError, Exception) as e:
+    except lxml_etree.XMLSyntaxError as e:
         print(f"Error parsing XML: {e}", file=sys.stderr)
         return {'device': device, 'fpc': fpc, 'pic': pic, 'transceivers': {}}
     
@@ -88,8 +142,11 @@ def parse_pic_detail(xml_content, device: str, fpc: int, pic: int,
     }
     
     # Find all port elements
-    for port_elem in findall_recursive_ns(root, 'port'):
-        port_number = findtext_ns(port_elem, 'port-number')
+    for port_elem in root.iter('{*}port'):
+        # Read all port fields in one pass over its children
+        port_fields = child_texts(port_elem)
+        
+        port_number = port_fields.get('port-number')
         if not port_number:
             continue
         
@@ -101,51 +158,31 @@ def parse_pic_detail(xml_content, device: str, fpc: int, pic: int,
         if not interface_name:
             continue
         
-        # Extract transceiver metadata
-        cable_type = findtext_ns(port_elem, 'cable-type')
-        fiber_mode = findtext_ns(port_elem, 'fiber-mode')
-        vendor_name = findtext_ns(port_elem, 'sfp-vendor-name')
-        vendor_pno = findtext_ns(port_elem, 'sfp-vendor-pno')
-        vendor_sn = findtext_ns(port_elem, 'sfp-vendor-sn')
-        wavelength = findtext_ns(port_elem, 'wavelength')
-        vendor_fw = findtext_ns(port_elem, 'sfp-vendor-fw-ver')
-        jnpr_ver = findtext_ns(port_elem, 'sfp-jnpr-ver')
-        
-        # Build transceiver metadata dictionary
-        transceiver = {}
-        
-        if vendor_name and vendor_name.lower() not in ['n/a', 'na', 'none', '']:
-            transceiver['vendor'] = vendor_name
+        # Build transceiver record
+        transceiver = Transceiver()
+        has_metadata = False
         
-        if vendor_pno and vendor_pno.lower() not in ['n/a', 'na', 'none', '']:
-            transceiver['part_number'] = vendor_pno
-        
-        if vendor_sn and vendor_sn.lower() not in ['n/a', 'na', 'none', '']:
-            transceiver['serial_number'] = vendor_sn
-        
-        if cable_type and cable_type.lower() not in ['n/a', 'na', 'none', '']:
-            transceiver['cable_type'] = cable_type
-            # Also use as media_type if not already set
-            if 'media_type' not in transceiver:
-                transceiver['media_type'] = cable_type
-        
-        if wavelength and wavelength.lower() not in ['n/a', 'na', 'none', '']:
-            transceiver['wavelength'] = wavelength
+        for key, tag, not_available in _PORT_FIELDS:
+            value = port_fields.get(tag)
+            if value and value.lower() not in not_available:
+                setattr(transceiver, key, value)
+                has_metadata = True
         
         # Convert fiber_mode to standardized fiber_type
-        fiber_type = parse_fiber_mode(fiber_mode)
+        fiber_type = parse_fiber_mode(port_fields.get('fiber-mode'))
         if fiber_type:
-            transceiver['fiber_type'] = fiber_type
+            transceiver.fiber_type = fiber_type
+            has_metadata = True
         
         # Store firmware versions if available
-        if vendor_fw and vendor_fw.lower() not in ['n/a', 'na', 'none', '', '0.0']:
-            transceiver['firmware_version'] = vendor_fw
-        
-        if jnpr_ver and jnpr_ver.lower() not in ['n/a', 'na', 'none', '']:
-            transceiver['juniper_version'] = jnpr_ver
+        for key, tag, not_available in _PORT_VERSION_FIELDS:
+            value = port_fields.get(tag)
+            if value and value.lower() not in not_available:
+                setattr(transceiver, key, value)
+                has_metadata = True
         
         # Only add if we have at least some metadata
-        if transceiver:
+        if has_metadata:
             result['transceivers'][interface_name] = transceiver
     
     return result
@@ -156,46 +193,99 @@ def extract_fpc_pic_slots(chassis_xml: str) -> list:
     Extract FPC and PIC slots from chassis hardware output.
     
     Args:
-        chassis_xml: XML string from get-chassis-inventory RPC response
+        chassis_xml: XML string or bytes from get-chassis-inventory RPC response
     
     Returns:
         List of (fpc, pic) tuples
     """
-    try:
-        root = ET.fromstring(chassis_xml)
-    except ET.ParseError as e:
-        print(f"Error parsing chassis XML: {e}", file=sys.stderr)
-        return []
+    if isinstance(chassis_xml, str):
+        chassis_xml = chassis_xml.encode('utf-8')
     
     slots = []
     
-    # Find all chassis modules (FPCs)
-    for module in findall_recursive_ns(root, 'chassis-module'):
-        module_name = findtext_ns(module, 'name', '')
-        
-        # Check if this is an FPC
-        if 'FPC' in module_name:
-            # Extract FPC number
-            import re
-            fpc_match = re.search(r'FPC\s+(\d+)', module_name, re.IGNORECASE)
-            if not fpc_match:
-                continue
-            fpc_num = int(fpc_match.group(1))
+    # Stream chassis modules (FPCs); each is released once handled, so large
+    # inventories are never held as a full tree
+    try:
+        for _, module in lxml_etree.iterparse(io.BytesIO(chassis_xml), events=('end',),
+                                              tag='{*}chassis-module',
+                                              remove_blank_text=True, huge_tree=True):
+            module_name = module.findtext('{*}name', '')
             
-            # Find all sub-modules (PICs)
-            for sub_module in findall_ns(module, 'chassis-sub-module'):
-                sub_name = findtext_ns(sub_module, 'name', '')
+            # Check if this is an FPC
+            fpc_match = _FPC_NAME_RE.search(module_name) if 'FPC' in module_name else None
+            if fpc_match:
+                fpc_num = int(fpc_match.group(1))
                 
-                if 'PIC' in sub_name:
-                    # Extract PIC number
-                    pic_match = re.search(r'PIC\s+(\d+)', sub_name, re.IGNORECASE)
-                    if pic_match:
-                        pic_num = int(pic_match.group(1))
-                        slots.append((fpc_num, pic_num))
+                # Find all sub-modules (PICs)
+                for sub_module in module.iterfind('{*}chassis-sub-module'):
+                    sub_name = sub_module.findtext('{*}name', '')
+                    
+                    if 'PIC' in sub_name:
+                        # Extract PIC number
+                        pic_match = _PIC_NAME_RE.search(sub_name)
+                        if pic_match:
+                            pic_num = int(pic_match.group(1))
+                            slots.append((fpc_num, pic_num))
+            
+            module.clear(keep_tail=True)
+            while module.getprevious() is not None:
+                del module.getparent()[0]
+    except lxml_etree.XMLSyntaxError as e:
+        print(f"Error parsing chassis XML: {e}", file=sys.stderr)
+        return []
     
     return slots
 
 
+def _parse_pic_file(spec: Tuple[str, str, int, int, Optional[str]]) -> Dict:
+    """Read and parse one PIC detail file; module-level so worker processes can run it."""
+    path, device, fpc, pic, platform_hint = spec
+    with open(path, 'rb') as f:
+        xml_content = f.read()
+    return parse_pic_detail(xml_content, device, fpc, pic, platform_hint)
+
+
+def parse_all_pics(xml_paths_by_slot: Dict[Tuple[int, int], str], device: str,
+                   platform_hint: Optional[str] = None, workers: Optional[int] = None) -> Dict:
+    """
+    Parse the PIC detail replies of many FPC/PIC slots in parallel.
+    
+    Each slot's reply is independent, so files are spread over a process pool.
+    A file that cannot be read is reported on stderr and skipped; malformed
+    XML yields no transceivers for its slot. Neither stops the other slots.
+    
+    Args:
+        xml_paths_by_slot: Dict mapping (fpc, pic) tuples to get-pic-detail XML file paths
+        device: Device hostname/IP
+        platform_hint: Optional platform identifier for interface name mapping
+        workers: Number of worker processes (defaults to CPU count)
+    
+    Returns:
+        Dictionary with:
+        - device: Device identifier
+        - transceivers: Transceiver metadata of all slots, keyed by interface name
+    """
+    specs = [(path, device, fpc, pic, platform_hint)
+             for (fpc, pic), path in sorted(xml_paths_by_slot.items())]
+    
+    all_transceivers = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(_parse_pic_file, spec) for spec in specs]
+        # Merge in slot order so results do not depend on timing
+        for spec, future in zip(specs, futures):
+            try:
+                result = future.result()
+            except (IOError, OSError) as e:
+                print(f"Error reading FPC {spec[2]} PIC {spec[3]} detail: {e}", file=sys.stderr)
+                continue
+            all_transceivers.update(result['transceivers'])
+    
+    return {
+        'device': device,
+        'transceivers': all_transceivers
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Parse Junos get-pic-detail RPC output for transceiver metadata'
@@ -219,14 +309,14 @@ def main():
     
     # If chassis-xml provided, extract all FPC/PIC slots
     if args.chassis_xml:
-        with open(args.chassis_xml, 'r') as f:
+        with open(args.chassis_xml, 'rb') as f:
             chassis_xml = f.read()
         slots = extract_fpc_pic_slots(chassis_xml)
         print(f"Discovered FPC/PIC slots: {slots}", file=sys.stderr)
     
     # Read input XML
     try:
-        with open(args.input, 'r') as f:
+        with open(args.input, 'rb') as f:
             xml_content = f.read()
     except IOError as e:
         print(f"Error reading input file: {e}", file=sys.stderr)
@@ -243,8 +333,7 @@ def main():
     
     # Write output JSON
     try:
-        with open(args.output, 'w') as f:
-            json.dump(result, f, indent=2)
+        write_json(args.output, result, default=Transceiver.to_dict)
         
         transceiver_count = len(result['transceivers'])
         print(f"Extracted {transceiver_count} transceiver(s) from FPC {args.fpc} PIC {args.pic}")
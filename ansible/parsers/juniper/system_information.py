@@ -8,16 +8,17 @@ RPC: <get-system-information/>
 """
 
 import argparse
-import xml.etree.ElementTree as ET
 import sys
-import json
 from typing import Dict
-import os
+from lxml import etree
 
 # Add parent directory to path for imports
 # sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from parsers.common.xml_utils import strip_namespace, findtext_ns
+from parsers.common.json_utils import write_json
+
+# Shared libxml2 parser: whitespace-only text and ID tracking are never used
+_PARSER = etree.XMLParser(remove_blank_text=True, collect_ids=False, huge_tree=True)
 
 
 def parse_system_information(xml_content: str, device: str) -> Dict:
@@ -25,7 +26,7 @@ def parse_system_information(xml_content: str, device: str) -> Dict:
     Parse system information XML and extract device metadata.
     
     Args:
-        xml_content: XML string from get-system-information RPC response
+        xml_content: XML string or bytes from get-system-information RPC response
         device: Device hostname/IP
     
     Returns:
@@ -36,29 +37,29 @@ def parse_system_information(xml_content: str, device: str) -> Dict:
         - os_name: Operating system name
         - os_version: Operating system version
     """
+    if isinstance(xml_content, str):
+        xml_content = xml_content.encode('utf-8')
+    
     try:
-        root = ET.fromstring(xml_content)
-    except ET.ParseError as e:
+        root = etree.fromstring(xml_content, _PARSER)
+    except etree.XMLSyntaxError as e:
         print(f"Error parsing XML: {e}", file=sys.stderr)
         return {'device': device}
     
-    # Find system-information element
-    sys_info = None
-    for elem in root.iter():
-        if strip_namespace(elem.tag) == 'system-information':
-            sys_info = elem
-            break
+    # Find system-information element (any namespace, root included)
+    sys_info = next(root.iter('{*}system-information'), None)
     
     if sys_info is None:
         print("Warning: No system-information element found", file=sys.stderr)
         return {'device': device}
     
+    # findtext() returns '' for empty elements; treat those as missing
     result = {
         'device': device,
-        'origin_hostname': findtext_ns(sys_info, 'host-name', device),
-        'hardware_model': findtext_ns(sys_info, 'hardware-model'),
-        'os_name': findtext_ns(sys_info, 'os-name'),
-        'os_version': findtext_ns(sys_info, 'os-version'),
+        'origin_hostname': sys_info.findtext('{*}host-name') or device,
+        'hardware_model': sys_info.findtext('{*}hardware-model') or None,
+        'os_name': sys_info.findtext('{*}os-name') or None,
+        'os_version': sys_info.findtext('{*}os-version') or None,
     }
     
     # Format device_profile as "Juniper_{model}"
@@ -84,7 +85,7 @@ def main():
     
     # Read input XML
     try:
-        with open(args.input, 'r') as f:
+        with open(args.input, 'rb') as f:
             xml_content = f.read()
     except IOError as e:
         print(f"Error reading input file: {e}", file=sys.stderr)
@@ -95,8 +96,7 @@ def main():
     
     # Write output
     try:
-        with open(args.output, 'w') as f:
-            json.dump(result, f, indent=2)
+        write_json(args.output, result)
         
         hostname = result.get('origin_hostname', 'unknown')
         model = result.get('device_profile', 'unknown')
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test suite for chassis_inventory.py directory mode
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from parsers.juniper.chassis_inventory import parse_directory
+
+
+CHASSIS_XML = '''<rpc-reply xmlns:junos="http://xml.juniper.net/junos/23.4R1/junos">
+<chassis-inventory xmlns="http://xml.juniper.net/junos/23.4R1/junos-chassis">
+<chassis junos:style="inventory">
+    <name>Chassis</name>
+    <serial-number>{serial}</serial-number>
+    <chassis-module>
+        <name>FPC 0</name>
+        <chassis-sub-module>
+            <name>PIC 0</name>
+            <chassis-sub-sub-module>
+                <name>Xcvr 6</name>
+                <serial-number>XCVR-{serial}</serial-number>
+            </chassis-sub-sub-module>
+            <chassis-sub-sub-module>
+                <name>Xcvr 7</name>
+                <serial-number>N/A</serial-number>
+            </chassis-sub-sub-module>
+        </chassis-sub-module>
+    </chassis-module>
+</chassis>
+</chassis-inventory>
+</rpc-reply>
+'''
+
+
+class TestParseDirectory(unittest.TestCase):
+    """Test parse_directory batch conversion"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmp.name, 'in')
+        self.output_dir = os.path.join(self.tmp.name, 'out')
+        os.makedirs(self.input_dir)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def write_input(self, device, content):
+        path = os.path.join(self.input_dir, f'{device}_chassis_inventory_raw.xml')
+        with open(path, 'w') as f:
+            f.write(content)
+    
+    def read_output(self, device):
+        path = os.path.join(self.output_dir, f'{device}_chassis_inventory_metrics.json')
+        with open(path) as f:
+            return json.load(f)
+    
+    def test_one_output_per_input(self):
+        """Test each input file produces its own JSON file"""
+        self.write_input('dev1', CHASSIS_XML.format(serial='SN1'))
+        self.write_input('dev2', CHASSIS_XML.format(serial='SN2'))
+        
+        failures = parse_directory(self.input_dir, self.output_dir,
+                                   '*_chassis_inventory_raw.xml', workers=2)
+        
+        self.assertEqual(failures, 0)
+        self.assertEqual(sorted(os.listdir(self.output_dir)),
+                         ['dev1_chassis_inventory_metrics.json',
+                          'dev2_chassis_inventory_metrics.json'])
+        
+        result = self.read_output('dev2')
+        self.assertEqual(result['device'], 'dev2')
+        self.assertEqual(result['origin_name'], 'SN2')
+        self.assertEqual(result['transceivers'], {
+            'et-0/0/6': {'serial_number': 'XCVR-SN2'},
+            'et-0/0/7': {},
+        })
+    
+    def test_malformed_file(self):
+        """Test a malformed file yields an empty result without stopping the batch"""
+        self.write_input('good', CHASSIS_XML.format(serial='SN1'))
+        self.write_input('bad', '<rpc-reply><chassis-inventory><chassis>')
+        
+        failures = parse_directory(self.input_dir, self.output_dir,
+                                   '*_chassis_inventory_raw.xml', workers=2)
+        
+        self.assertEqual(failures, 0)
+        self.assertEqual(self.read_output('bad'),
+                         {'device': 'bad', 'origin_name': None, 'transceivers': {}})
+        self.assertEqual(self.read_output('good')['origin_name'], 'SN1')
+    
+    def test_write_failure_counted(self):
+        """Test an output that cannot be written is counted as a failure"""
+        self.write_input('dev1', CHASSIS_XML.format(serial='SN1'))
+        self.write_input('dev2', CHASSIS_XML.format(serial='SN2'))
+        # A directory in place of the output file makes the write fail
+        os.makedirs(os.path.join(self.output_dir, 'dev1_chassis_inventory_metrics.json'))
+        
+        failures = parse_directory(self.input_dir, self.output_dir,
+                                   '*_chassis_inventory_raw.xml', workers=2)
+        
+        self.assertEqual(failures, 1)
+        self.assertEqual(self.read_output('dev2')['origin_name'], 'SN2')
+    
+    def test_no_matching_files(self):
+        """Test an empty directory is not an error"""
+        failures = parse_directory(self.input_dir, self.output_dir,
+                                   '*_chassis_inventory_raw.xml')
+        
+        self.assertEqual(failures, 0)
+        self.assertFalse(os.path.exists(self.output_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Test suite for interface_statistics.py batch parsing and output formats
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from parsers.juniper.interface_statistics import parse_interface_statistics, parse_many, write_output
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+INTERFACE_XML = '''<rpc-reply xmlns:junos="http://xml.juniper.net/junos/23.4R1/junos">
+<interface-information xmlns="http://xml.juniper.net/junos/23.4R1/junos-interface" junos:style="normal">
+    <physical-interface>
+        <name>et-0/0/0</name>
+        <admin-status junos:format="Enabled">up</admin-status>
+        <oper-status>up</oper-status>
+        <speed>400Gbps</speed>
+        <traffic-statistics junos:style="brief">
+            <input-bps>{input_bps}</input-bps>
+            <output-bps>2000</output-bps>
+        </traffic-statistics>
+        <ethernet-fec-statistics junos:style="verbose">
+            <fec_ccw_count>{ccw}</fec_ccw_count>
+            <fec_nccw_count>0</fec_nccw_count>
+            <fec_ccw_error_rate>5</fec_ccw_error_rate>
+            <fec_nccw_error_rate>0</fec_nccw_error_rate>
+            <pre-fec-ber>1.2e-09</pre-fec-ber>
+        </ethernet-fec-statistics>
+        <ethernet-fechistogram-statistics>
+            <bin-num>0</bin-num>
+            <sym-live-err>10</sym-live-err>
+            <sym-harvest-err>1,000</sym-harvest-err>
+        </ethernet-fechistogram-statistics>
+        <ethernet-fechistogram-statistics>
+            <bin-num>1</bin-num>
+            <sym-live-err>2</sym-live-err>
+            <sym-harvest-err>3</sym-harvest-err>
+        </ethernet-fechistogram-statistics>
+    </physical-interface>
+    <physical-interface>
+        <name>et-0/0/1</name>
+        <admin-status junos:format="Enabled">up</admin-status>
+        <oper-status>down</oper-status>
+        <speed>100Gbps</speed>
+        <ethernet-fec-statistics junos:style="verbose">
+            <fec_ccw_count>7</fec_ccw_count>
+            <fec_nccw_count>1</fec_nccw_count>
+        </ethernet-fec-statistics>
+    </physical-interface>
+    <physical-interface>
+        <name>em0</name>
+        <admin-status junos:format="Enabled">up</admin-status>
+        <oper-status>up</oper-status>
+    </physical-interface>
+</interface-information>
+</rpc-reply>
+'''
+
+
+def without_collection_time(result):
+    """Drop the per-call collection time fields so two parses compare equal"""
+    return [{k: v for k, v in interface.items() if k not in ('timestamp', 'collection_time')}
+            for interface in result['interfaces']]
+
+
+class TestParseMany(unittest.TestCase):
+    """Test parse_many batch parsing against per-file parsing"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.specs = []
+        for device, ccw, input_bps in (('dev1', '1,234', '1000'), ('dev2', '99', '3000')):
+            path = os.path.join(self.tmp.name, f'{device}_interface_statistics.xml')
+            with open(path, 'w') as f:
+                f.write(INTERFACE_XML.format(ccw=ccw, input_bps=input_bps))
+            self.specs.append((path, device))
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def parse_each(self, interface_filter=None):
+        results = []
+        for path, device in self.specs:
+            with open(path, 'rb') as f:
+                results.append(parse_interface_statistics(f.read(), device, interface_filter))
+        return results
+    
+    def test_matches_per_file_parse(self):
+        """Test batch results match parsing each file on its own, in input order"""
+        batch = parse_many(self.specs, workers=2)
+        
+        self.assertEqual([without_collection_time(r) for r in batch],
+                         [without_collection_time(r) for r in self.parse_each()])
+        self.assertEqual([r['interfaces'][0]['device'] for r in batch], ['dev1', 'dev2'])
+        self.assertEqual(batch[0]['interfaces'][0]['fec_ccw'], 1234.0)
+        self.assertEqual(batch[1]['interfaces'][0]['fec_ccw'], 99.0)
+        # Interfaces without FEC data are left out
+        self.assertEqual([i['if_name'] for i in batch[0]['interfaces']], ['et-0/0/0', 'et-0/0/1'])
+    
+    def test_interface_filter(self):
+        """Test the interface filter is applied in every worker"""
+        batch = parse_many(self.specs, ['et-0/0/1'], workers=2)
+        
+        self.assertEqual([without_collection_time(r) for r in batch],
+                         [without_collection_time(r) for r in self.parse_each(['et-0/0/1'])])
+        for result in batch:
+            self.assertEqual([i['if_name'] for i in result['interfaces']], ['et-0/0/1'])
+
+
+class TestWriteOutput(unittest.TestCase):
+    """Test NDJSON and Parquet outputs round-trip the parsed records"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.result = parse_interface_statistics(
+            INTERFACE_XML.format(ccw='1,234', input_bps='1000'), 'dev1')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_ndjson_round_trip(self):
+        """Test NDJSON output holds one interface record per line"""
+        path = os.path.join(self.tmp.name, 'stats.ndjson')
+        write_output(path, self.result, 'ndjson')
+        
+        with open(path) as f:
+            lines = f.read().splitlines()
+        
+        self.assertEqual(len(lines), 2)
+        self.assertEqual([json.loads(line) for line in lines], self.result['interfaces'])
+    
+    @unittest.skipUnless(pq is not None, 'pyarrow not installed')
+    def test_parquet_round_trip(self):
+        """Test Parquet output reads back as one row per interface"""
+        path = os.path.join(self.tmp.name, 'stats.parquet')
+        write_output(path, self.result, 'parquet')
+        
+        table = pq.read_table(path)
+        rows = table.to_pylist()
+        
+        self.assertEqual(str(table.schema.field('fec_ccw').type), 'uint64')
+        self.assertEqual(str(table.schema.field('pre_fec_ber').type), 'float')
+        self.assert_rows_match(rows, self.result['interfaces'])
+    
+    @unittest.skipUnless(pq is not None, 'pyarrow not installed')
+    def test_parquet_keeps_columns_missing_from_first_record(self):
+        """Test optional fields are kept when the first record lacks them"""
+        # et-0/0/1 has no traffic, BER or histogram fields
+        interfaces = self.result['interfaces'][::-1]
+        self.assertNotIn('pre_fec_ber', interfaces[0])
+        path = os.path.join(self.tmp.name, 'stats.parquet')
+        write_output(path, {'interfaces': interfaces}, 'parquet')
+        
+        table = pq.read_table(path)
+        
+        for name in ('speed_bps', 'input_bps', 'output_bps', 'pre_fec_ber',
+                     'histogram_bin_0', 'histogram_bin_1_live', 'histogram_bin_15_harvest'):
+            self.assertIn(name, table.schema.names)
+        self.assert_rows_match(table.to_pylist(), interfaces)
+    
+    @unittest.skipUnless(pq is not None, 'pyarrow not installed')
+    def test_parquet_value_out_of_range(self):
+        """Test a value that does not fit its column raises ValueError"""
+        interfaces = [dict(self.result['interfaces'][0], fec_ccw=-1.0)]
+        path = os.path.join(self.tmp.name, 'stats.parquet')
+        
+        with self.assertRaises(ValueError):
+            write_output(path, {'interfaces': interfaces}, 'parquet')
+    
+    def assert_rows_match(self, rows, interfaces):
+        self.assertEqual(len(rows), len(interfaces))
+        for row, expected in zip(rows, interfaces):
+            # Every known field is a column; fields a record lacks are null
+            for key in set(row) - set(expected):
+                self.assertIsNone(row[key])
+            for key, value in expected.items():
+                if isinstance(value, float):
+                    # Rates and BER are stored in single precision
+                    self.assertAlmostEqual(row[key], value, delta=abs(value) * 1e-6)
+                else:
+                    self.assertEqual(row[key], value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test suite for merge_metadata.py with in-memory parser results
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from parsers.juniper.chassis_inventory import parse_chassis_inventory
+from parsers.juniper.merge_metadata import merge_metadata
+from parsers.juniper.pic_detail import Transceiver
+
+
+CHASSIS_XML = '''<rpc-reply xmlns:junos="http://xml.juniper.net/junos/23.4R1/junos">
+<chassis-inventory xmlns="http://xml.juniper.net/junos/23.4R1/junos-chassis">
+<chassis junos:style="inventory">
+    <name>Chassis</name>
+    <serial-number>CHASSIS-SN</serial-number>
+    <chassis-module>
+        <name>FPC 0</name>
+        <chassis-sub-module>
+            <name>PIC 0</name>
+            <chassis-sub-sub-module>
+                <name>Xcvr 6</name>
+                <serial-number>XCVR-SN6</serial-number>
+            </chassis-sub-sub-module>
+            <chassis-sub-sub-module>
+                <name>Xcvr 7</name>
+                <serial-number>XCVR-SN7</serial-number>
+            </chassis-sub-sub-module>
+        </chassis-sub-module>
+    </chassis-module>
+</chassis>
+</chassis-inventory>
+</rpc-reply>
+'''
+
+
+class TestMergeParsedRecords(unittest.TestCase):
+    """Test merge_metadata accepts parser results without a JSON round trip"""
+    
+    def setUp(self):
+        self.system_info = {'device': 'dev1.example.net', 'origin_hostname': 'dev1',
+                            'device_profile': 'Juniper_QFX5240-64D'}
+        self.optics = {
+            'interfaces': [{'if_name': 'et-0/0/6', 'temperature': 39.0},
+                           {'if_name': 'et-0/0/7:1', 'temperature': 28.2}],
+            'lanes': [{'if_name': 'et-0/0/7:1', 'lane': 0, 'rx_power': -1.2}],
+        }
+    
+    def test_chassis_inventory_records(self):
+        """Test TransceiverInfo records supply serial numbers"""
+        chassis_inv = parse_chassis_inventory(CHASSIS_XML, 'dev1.example.net', 'qfx5240')
+        
+        merged = merge_metadata(self.system_info, chassis_inv, self.optics)
+        
+        interface, channel = merged['interfaces']
+        self.assertEqual(interface['serial_number'], 'XCVR-SN6')
+        self.assertEqual(interface['origin_name'], 'CHASSIS-SN')
+        self.assertEqual(interface['origin_hostname'], 'dev1')
+        # Channelized interfaces and their lanes use the base port's transceiver
+        self.assertEqual(channel['serial_number'], 'XCVR-SN7')
+        self.assertEqual(merged['lanes'][0]['serial_number'], 'XCVR-SN7')
+    
+    def test_pic_detail_records(self):
+        """Test Transceiver records supply vendor data and take priority for serial numbers"""
+        chassis_inv = parse_chassis_inventory(CHASSIS_XML, 'dev1.example.net', 'qfx5240')
+        pic_detail = {'transceivers': {
+            'et-0/0/6': Transceiver(vendor='JUNIPER', part_number='740-085351',
+                                    serial_number='PIC-SN6', wavelength='1310 nm'),
+        }}
+        
+        merged = merge_metadata(self.system_info, chassis_inv, self.optics, pic_detail)
+        
+        interface = merged['interfaces'][0]
+        self.assertEqual(interface['vendor'], 'JUNIPER')
+        self.assertEqual(interface['part_number'], '740-085351')
+        self.assertEqual(interface['serial_number'], 'PIC-SN6')
+        self.assertNotIn('media_type', interface)
+        self.assertEqual(merged['interfaces'][1]['serial_number'], 'XCVR-SN7')
+
+
+if __name__ == '__main__':
+    unittest.main()
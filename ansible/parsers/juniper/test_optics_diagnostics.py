@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test suite for optics_diagnostics.py column conversion
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from parsers.juniper.optics_diagnostics import metrics_to_columns, parse_optical_diagnostics
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'test_data', 'juniper')
+
+
+@unittest.skipUnless(np is not None, 'numpy not installed')
+class TestMetricsToColumns(unittest.TestCase):
+    """Test metrics_to_columns column layout"""
+    
+    def test_parsed_records(self):
+        """Test every record field becomes one column with one entry per record"""
+        with open(os.path.join(TEST_DATA_DIR, 'optics_rpc_response.xml'), 'rb') as f:
+            result = parse_optical_diagnostics(f.read(), 'dev1')
+        
+        for records in (result['interfaces'], result['lanes']):
+            columns = metrics_to_columns(records)
+            self.assertEqual(list(columns), list(records[0]))
+            for field, column in columns.items():
+                self.assertEqual(len(column), len(records), field)
+        
+        columns = metrics_to_columns(result['lanes'])
+        self.assertEqual(columns['lane'].dtype, np.int64)
+        self.assertEqual(columns['rx_power'].dtype, np.float64)
+        self.assertEqual(columns['if_name'].tolist(), [lane['if_name'] for lane in result['lanes']])
+    
+    def test_missing_values(self):
+        """Test fields absent from some records are padded: None for text, NaN for numbers"""
+        records = [
+            {'if_name': 'et-0/0/0', 'lane': 0, 'rx_power': -1.5, 'vendor': 'JUNIPER'},
+            {'if_name': 'et-0/0/1', 'lane': 1, 'rx_power': None},
+            {'if_name': 'et-0/0/2', 'tx_bias': 6.1},
+        ]
+        
+        columns = metrics_to_columns(records)
+        
+        self.assertEqual(list(columns), ['if_name', 'lane', 'rx_power', 'vendor', 'tx_bias'])
+        self.assertEqual({len(column) for column in columns.values()}, {3})
+        self.assertEqual(columns['vendor'].dtype, object)
+        self.assertEqual(columns['vendor'].tolist(), ['JUNIPER', None, None])
+        # An integer field missing from a record can no longer be int64
+        self.assertEqual(columns['lane'].dtype, np.float64)
+        self.assertEqual(columns['lane'][:2].tolist(), [0.0, 1.0])
+        self.assertTrue(np.isnan(columns['lane'][2]))
+        self.assertEqual(columns['rx_power'][0], -1.5)
+        self.assertTrue(np.isnan(columns['rx_power'][1:]).all())
+        self.assertTrue(np.isnan(columns['tx_bias'][:2]).all())
+    
+    def test_no_records(self):
+        """Test an empty record list gives no columns"""
+        self.assertEqual(metrics_to_columns([]), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test suite for pic_detail.py parallel slot parsing
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from parsers.juniper.pic_detail import parse_all_pics
+
+
+PIC_XML = '''<rpc-reply xmlns:junos="http://xml.juniper.net/junos/23.4R1/junos">
+<fpc-information xmlns="http://xml.juniper.net/junos/23.4R1/junos-chassis">
+<fpc>
+    <pic-detail>
+        <port-information>
+{ports}
+        </port-information>
+    </pic-detail>
+</fpc>
+</fpc-information>
+</rpc-reply>
+'''
+
+PORT_XML = '''            <port>
+                <port-number>{port}</port-number>
+                <cable-type>100GBASE-SR4</cable-type>
+                <fiber-mode>MM</fiber-mode>
+                <sfp-vendor-name>{vendor}</sfp-vendor-name>
+                <sfp-vendor-pno>740-058734</sfp-vendor-pno>
+                <wavelength>850 nm</wavelength>
+            </port>'''
+
+
+class TestParseAllPics(unittest.TestCase):
+    """Test parse_all_pics merges slot replies from a process pool"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def write_slot(self, fpc, pic, content):
+        path = os.path.join(self.tmp.name, f'pic_{fpc}_{pic}.xml')
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+    
+    def slot_xml(self, vendor, ports):
+        return PIC_XML.format(ports='\n'.join(PORT_XML.format(port=port, vendor=vendor)
+                                              for port in ports))
+    
+    def test_slots_merged_in_slot_order(self):
+        """Test all slots are merged in (fpc, pic) order regardless of input order"""
+        paths = {
+            (1, 0): self.write_slot(1, 0, self.slot_xml('VENDOR-B', [0])),
+            (0, 1): self.write_slot(0, 1, self.slot_xml('VENDOR-A', [2, 0])),
+            (0, 0): self.write_slot(0, 0, self.slot_xml('JUNIPER', [6, 7])),
+        }
+        
+        result = parse_all_pics(paths, 'dev1', 'qfx5240', workers=2)
+        
+        self.assertEqual(result['device'], 'dev1')
+        self.assertEqual(list(result['transceivers']),
+                         ['et-0/0/6', 'et-0/0/7', 'et-0/1/2', 'et-0/1/0', 'et-1/0/0'])
+        transceiver = result['transceivers']['et-0/1/2'].to_dict()
+        self.assertEqual(transceiver['vendor'], 'VENDOR-A')
+        self.assertEqual(transceiver['media_type'], '100GBASE-SR4')
+        self.assertEqual(result['transceivers']['et-1/0/0'].get('vendor'), 'VENDOR-B')
+    
+    def test_bad_files_do_not_abort_batch(self):
+        """Test a missing file and malformed XML only lose their own slots"""
+        paths = {
+            (0, 0): self.write_slot(0, 0, self.slot_xml('JUNIPER', [6])),
+            (0, 1): os.path.join(self.tmp.name, 'missing.xml'),
+            (0, 2): self.write_slot(0, 2, '<rpc-reply><fpc-information>'),
+            (1, 0): self.write_slot(1, 0, self.slot_xml('VENDOR-B', [0])),
+        }
+        
+        with mock.patch('sys.stderr'):
+            result = parse_all_pics(paths, 'dev1', 'qfx5240', workers=2)
+        
+        self.assertEqual(list(result['transceivers']), ['et-0/0/6', 'et-1/0/0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
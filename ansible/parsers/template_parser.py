@@ -7,27 +7,31 @@ Copy this file and customize for different RPC outputs.
 import argparse
 import xml.etree.ElementTree as ET
 import sys
-from typing import List
+from typing import TextIO
 
 
-def parse_rpc_output(xml_content: str, device: str) -> List[str]:
+def parse_rpc_output(xml_content: str, device: str, out_stream: TextIO) -> int:
     """
-    Parse RPC XML output and convert to Prometheus metrics.
+    Parse RPC XML output and write Prometheus metrics to a stream.
+    
+    Each metric line is written as soon as it is built rather than collected
+    into a list and joined, so memory use does not grow with the metric count.
     
     Args:
         xml_content: XML string from RPC response
         device: Device hostname/IP
+        out_stream: Text stream receiving one Prometheus metric line per metric
     
     Returns:
-        List of Prometheus metric lines
+        Number of metric lines written
     """
-    metrics = []
+    count = 0
     
     try:
         root = ET.fromstring(xml_content)
     except ET.ParseError as e:
         print(f"Error parsing XML: {e}", file=sys.stderr)
-        return []
+        return 0
     
     # TODO: Customize this section based on your RPC output structure
     # Example:
@@ -36,9 +40,10 @@ def parse_rpc_output(xml_content: str, device: str) -> List[str]:
     #     value = element.findtext('value', '0')
     #     
     #     labels = f'device="{device}",element_name="{name}"'
-    #     metrics.append(f'junos_custom_metric{{{labels}}} {value}')
+    #     out_stream.write(f'junos_custom_metric{{{labels}}} {value}\n')
+    #     count += 1
     
-    return metrics
+    return count
 
 
 def main():
@@ -59,22 +64,17 @@ def main():
         print(f"Error reading input file: {e}", file=sys.stderr)
         sys.exit(1)
     
-    # Parse and convert to metrics
-    metrics = parse_rpc_output(xml_content, args.device)
-    
-    if not metrics:
-        print("Warning: No metrics generated", file=sys.stderr)
-    
-    # Write output
+    # Parse and stream metrics straight into the output file
     try:
         with open(args.output, 'w') as f:
-            f.write('\n'.join(metrics))
-            if metrics:
-                f.write('\n')
-        print(f"Generated {len(metrics)} metrics")
+            count = parse_rpc_output(xml_content, args.device, f)
     except IOError as e:
         print(f"Error writing output file: {e}", file=sys.stderr)
         sys.exit(1)
+    
+    if not count:
+        print("Warning: No metrics generated", file=sys.stderr)
+    print(f"Generated {count} metrics")
 
 
 if __name__ == '__main__':
@@ -5,38 +5,35 @@ Uses chassis inventory to discover slots, then queries each one.
 """
 
 import argparse
-import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Union
 from ncclient import manager
-from parsers.juniper.pic_detail import parse_pic_detail, extract_fpc_pic_slots
-from parsers.juniper.chassis_inventory import parse_chassis_inventory
+from parsers.juniper.pic_detail import parse_pic_detail, extract_fpc_pic_slots, Transceiver
+from parsers.common.json_utils import write_json
 from lxml import etree
 
 
-def collect_pic_details(host: str, username: str, password: str, port: int, 
-                        chassis_xml: str, platform_hint: str = None) -> dict:
+def _query_slots(host: str, username: str, password: str, port: int,
+                 slots: List[Tuple[int, int]], platform_hint: str = None) -> dict:
     """
-    Collect PIC details for all FPC/PIC slots.
+    Query PIC details for a group of FPC/PIC slots over one NETCONF session.
+    
+    ncclient sessions are not safe to share between threads, so every worker
+    thread of collect_pic_details() opens its own session through this function.
     
     Args:
         host: Device hostname/IP
         username: NETCONF username
         password: NETCONF password
         port: NETCONF port
-        chassis_xml: Chassis inventory XML to discover FPC/PIC slots
+        slots: (fpc, pic) tuples to query
         platform_hint: Optional platform hint for interface naming
     
     Returns:
-        Combined dictionary with all transceiver metadata
+        Dictionary mapping interface names to transceiver metadata
     """
-    # Extract FPC/PIC slots from chassis inventory
-    slots = extract_fpc_pic_slots(chassis_xml)
-    
-    if not slots:
-        print("No FPC/PIC slots found in chassis inventory", file=sys.stderr)
-        return {'device': host, 'transceivers': {}}
-    
-    print(f"Discovered {len(slots)} FPC/PIC slot(s): {slots}", file=sys.stderr)
+    transceivers = {}
     
     # Connect to device
     try:
@@ -50,8 +47,6 @@ def collect_pic_details(host: str, username: str, password: str, port: int,
             timeout=30
         ) as conn:
             
-            all_transceivers = {}
-            
             # Query each FPC/PIC
             for fpc, pic in slots:
                 rpc_str = f'''
@@ -65,15 +60,13 @@ def collect_pic_details(host: str, username: str, password: str, port: int,
                     rpc_elem = etree.fromstring(rpc_str)
                     response = conn.rpc(rpc_elem)
                     
-                    # Convert NCElement to string - tostring is a property that returns bytes
-                    xml_bytes = response.tostring
-                    xml_str = xml_bytes.decode('utf-8') if isinstance(xml_bytes, bytes) else xml_bytes
-                    
-                    # Parse the response
-                    result = parse_pic_detail(xml_str, host, fpc, pic, platform_hint)
+                    # tostring is a property holding the reply XML (bytes);
+                    # parse_pic_detail takes bytes as-is, so there is no
+                    # decode to str and re-encode before parsing
+                    result = parse_pic_detail(response.tostring, host, fpc, pic, platform_hint)
                     
                     # Merge transceivers
-                    all_transceivers.update(result['transceivers'])
+                    transceivers.update(result['transceivers'])
                     
                     print(f"FPC {fpc} PIC {pic}: {len(result['transceivers'])} transceiver(s)", 
                           file=sys.stderr)
@@ -82,14 +75,60 @@ def collect_pic_details(host: str, username: str, password: str, port: int,
                     print(f"Error querying FPC {fpc} PIC {pic}: {e}", file=sys.stderr)
                     continue
             
-            return {
-                'device': host,
-                'transceivers': all_transceivers
-            }
-            
     except Exception as e:
         print(f"Error connecting to device: {e}", file=sys.stderr)
+    
+    return transceivers
+
+
+def collect_pic_details(host: str, username: str, password: str, port: int, 
+                        chassis_xml: Union[str, bytes], platform_hint: str = None,
+                        workers: int = 4) -> dict:
+    """
+    Collect PIC details for all FPC/PIC slots.
+    
+    Each get-pic-detail RPC is a network round trip, so the slots are split
+    across up to `workers` threads, each with its own NETCONF session, and
+    the round trips overlap instead of running back to back.
+    
+    Args:
+        host: Device hostname/IP
+        username: NETCONF username
+        password: NETCONF password
+        port: NETCONF port
+        chassis_xml: Chassis inventory XML (str or bytes) to discover FPC/PIC slots
+        platform_hint: Optional platform hint for interface naming
+        workers: Maximum number of concurrent NETCONF sessions
+    
+    Returns:
+        Combined dictionary with all transceiver metadata
+    """
+    # Extract FPC/PIC slots from chassis inventory
+    slots = extract_fpc_pic_slots(chassis_xml)
+    
+    if not slots:
+        print("No FPC/PIC slots found in chassis inventory", file=sys.stderr)
         return {'device': host, 'transceivers': {}}
+    
+    print(f"Discovered {len(slots)} FPC/PIC slot(s): {slots}", file=sys.stderr)
+    
+    # Deal slots round-robin so each session gets an even share
+    session_count = max(1, min(workers, len(slots)))
+    slot_groups = [slots[i::session_count] for i in range(session_count)]
+    
+    all_transceivers = {}
+    with ThreadPoolExecutor(max_workers=session_count) as pool:
+        futures = [pool.submit(_query_slots, host, username, password, port,
+                               group, platform_hint)
+                   for group in slot_groups]
+        # Merge in submission order so results do not depend on timing
+        for future in futures:
+            all_transceivers.update(future.result())
+    
+    return {
+        'device': host,
+        'transceivers': all_transceivers
+    }
 
 
 def main():
@@ -110,12 +149,14 @@ def main():
                         help='Path to output JSON file')
     parser.add_argument('--platform',
                         help='Platform hint for interface naming')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Maximum concurrent NETCONF sessions (default: 4)')
     
     args = parser.parse_args()
     
     # Read chassis XML
     try:
-        with open(args.chassis_xml, 'r') as f:
+        with open(args.chassis_xml, 'rb') as f:
             chassis_xml = f.read()
     except IOError as e:
         print(f"Error reading chassis XML: {e}", file=sys.stderr)
@@ -128,13 +169,13 @@ def main():
         args.password,
         args.port,
         chassis_xml,
-        args.platform
+        args.platform,
+        args.workers
     )
     
     # Write output
     try:
-        with open(args.output, 'w') as f:
-            json.dump(result, f, indent=2)
+        write_json(args.output, result, default=Transceiver.to_dict)
         
         print(f"Collected {len(result['transceivers'])} total transceiver(s)")
         
@@ -5,9 +5,142 @@ Supports both JSON and Prometheus line protocol formats.
 """
 
 import argparse
+import gzip
+import io
+import os
 import requests
 import sys
 import json
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from parsers.common.json_utils import read_json
+
+
+# Record metadata copied into labels when set, in label order
+_LABEL_FIELDS = (
+    # Device-level metadata
+    'origin_hostname', 'device_profile', 'origin_name',
+    # Transceiver metadata
+    'vendor', 'part_number', 'serial_number', 'media_type', 'cable_type',
+    'wavelength', 'fiber_type',
+)
+
+# (JSON key, metric name) pairs emitted per interface ahead of the status metrics
+_INTERFACE_METRICS = (
+    # Temperature thresholds
+    ('temperature_high_alarm', 'temperature_high_alarm'),
+    ('temperature_low_alarm', 'temperature_low_alarm'),
+    ('temperature_high_warn', 'temperature_high_warn'),
+    ('temperature_low_warn', 'temperature_low_warn'),
+    # Voltage thresholds
+    ('voltage_high_alarm', 'voltage_high_alarm'),
+    ('voltage_low_alarm', 'voltage_low_alarm'),
+    ('voltage_high_warn', 'voltage_high_warn'),
+    ('voltage_low_warn', 'voltage_low_warn'),
+    # TX power thresholds
+    ('tx_power_high_alarm', 'tx_power_high_alarm'),
+    ('tx_power_low_alarm', 'tx_power_low_alarm'),
+    ('tx_power_high_warn', 'tx_power_high_warn'),
+    ('tx_power_low_warn', 'tx_power_low_warn'),
+    # RX power thresholds
+    ('rx_power_high_alarm', 'rx_power_high_alarm'),
+    ('rx_power_low_alarm', 'rx_power_low_alarm'),
+    ('rx_power_high_warn', 'rx_power_high_warn'),
+    ('rx_power_low_warn', 'rx_power_low_warn'),
+    # TX bias current thresholds
+    ('tx_bias_high_alarm', 'tx_bias_high_alarm'),
+    ('tx_bias_low_alarm', 'tx_bias_low_alarm'),
+    ('tx_bias_high_warn', 'tx_bias_high_warn'),
+    ('tx_bias_low_warn', 'tx_bias_low_warn'),
+    # Current measured values (always at interface level)
+    ('temperature', 'temperature'),
+    ('voltage', 'voltage'),
+    # DOM metrics at interface level (for interfaces without lanes)
+    ('tx_bias', 'tx_bias'),
+    ('tx_power_mw', 'tx_power_mw'),
+    ('tx_power', 'tx_power'),
+    ('rx_power_mw', 'rx_power_mw'),
+    ('rx_power', 'rx_power'),
+)
+
+# Interface status strings, exported as 1 for 'up' and 0 otherwise
+_INTERFACE_STATUS_METRICS = (
+    ('admin_status', 'interface_admin_status'),
+    ('oper_status', 'interface_oper_status'),
+)
+
+# Interface statistics emitted after the status metrics
+_INTERFACE_STATS_METRICS = (
+    # Speed and traffic
+    ('speed_bps', 'interface_speed_bps'),
+    ('input_bps', 'interface_input_bps'),
+    ('input_pps', 'interface_input_pps'),
+    ('output_bps', 'interface_output_bps'),
+    ('output_pps', 'interface_output_pps'),
+    # FEC statistics (Forward Error Correction)
+    ('fec_ccw', 'interface_fec_ccw'),
+    ('fec_nccw', 'interface_fec_nccw'),
+    ('fec_ccw_error_rate', 'interface_fec_ccw_error_rate'),
+    ('fec_nccw_error_rate', 'interface_fec_nccw_error_rate'),
+    ('pre_fec_ber', 'interface_pre_fec_ber'),
+)
+
+# FEC codeword error histogram bins 0-15
+_HISTOGRAM_METRICS = tuple((f'histogram_bin_{i}', f'interface_fec_histogram_bin_{i}')
+                           for i in range(16))
+
+# Lane-level measurements
+_LANE_METRICS = (
+    ('rx_power_mw', 'rx_power_mw'),
+    ('rx_power', 'rx_power'),
+    ('tx_power_mw', 'tx_power_mw'),
+    ('tx_power', 'tx_power'),
+    ('tx_bias', 'tx_bias'),
+)
+
+
+# Characters that must be backslash-escaped inside a label value
+_ESCAPE = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n'})
+
+
+def _escape_label_value(value) -> str:
+    """
+    Escape a label value for the Prometheus text format.
+    
+    Args:
+        value: Label value (converted to str)
+    
+    Returns:
+        Value with backslash, double quote and newline escaped
+    """
+    value = str(value)
+    # Nearly all values need no escaping; skip building a translated copy
+    if '\\' not in value and '"' not in value and '\n' not in value:
+        return value
+    return value.translate(_ESCAPE)
+
+
+def _label_prefix(record: dict, labels: list) -> str:
+    """
+    Build the label block shared by every metric of one interface or lane.
+    
+    Args:
+        record: Interface or lane record
+        labels: Identifying labels (interface, lane) to start the block with
+    
+    Returns:
+        '{labels} ' prefix; a metric line is the metric name + prefix + value
+    
+    Label values are escaped here, once per record, so the metric lines that
+    share the prefix need no further escaping.
+    """
+    get = record.get
+    for key in _LABEL_FIELDS:
+        value = get(key)
+        if value:
+            labels.append(f'{key}="{_escape_label_value(value)}"')
+    return '{' + ','.join(labels) + '} '
 
 
 def json_to_prometheus(data: dict, job: str, instance: str) -> str:
@@ -22,208 +155,69 @@ def json_to_prometheus(data: dict, job: str, instance: str) -> str:
     Returns:
         Prometheus line protocol string
     """
-    lines = []
+    # Lines are written straight into one growing buffer rather than kept as
+    # a list of strings and joined at the end
+    buf = io.StringIO()
+    write = buf.write
     
     # Process interface-level metrics (thresholds and FEC statistics)
     for interface in data.get('interfaces', []):
+        # One dict lookup per field: the bound get is reused and each value
+        # is read once for both the presence test and the emitted line
+        get = interface.get
+        
         # Get interface name (uniform 'if_name' across all metric types)
-        if_name = interface.get('if_name', 'unknown')
+        if_name = _escape_label_value(get('if_name', 'unknown'))
         
         # Build base labels with metadata
-        labels = [
-            f'interface="{if_name}"'
-        ]
-        
-        # Add device-level metadata
-        if interface.get('origin_hostname'):
-            labels.append(f'origin_hostname="{interface["origin_hostname"]}"')
-        if interface.get('device_profile'):
-            labels.append(f'device_profile="{interface["device_profile"]}"')
-        if interface.get('origin_name'):
-            labels.append(f'origin_name="{interface["origin_name"]}"')
-        
-        # Add transceiver metadata
-        if interface.get('vendor'):
-            labels.append(f'vendor="{interface["vendor"]}"')
-        if interface.get('part_number'):
-            labels.append(f'part_number="{interface["part_number"]}"')
-        if interface.get('serial_number'):
-            labels.append(f'serial_number="{interface["serial_number"]}"')
-        if interface.get('media_type'):
-            labels.append(f'media_type="{interface["media_type"]}"')
-        if interface.get('cable_type'):
-            labels.append(f'cable_type="{interface["cable_type"]}"')
-        if interface.get('wavelength'):
-            labels.append(f'wavelength="{interface["wavelength"]}"')
-        if interface.get('fiber_type'):
-            labels.append(f'fiber_type="{interface["fiber_type"]}"')
-        
-        base_labels = ','.join(labels)
-        
-        # Temperature thresholds
-        if interface.get('temperature_high_alarm') is not None:
-            lines.append(f'temperature_high_alarm{{{base_labels}}} {interface["temperature_high_alarm"]}')
-        if interface.get('temperature_low_alarm') is not None:
-            lines.append(f'temperature_low_alarm{{{base_labels}}} {interface["temperature_low_alarm"]}')
-        if interface.get('temperature_high_warn') is not None:
-            lines.append(f'temperature_high_warn{{{base_labels}}} {interface["temperature_high_warn"]}')
-        if interface.get('temperature_low_warn') is not None:
-            lines.append(f'temperature_low_warn{{{base_labels}}} {interface["temperature_low_warn"]}')
+        prefix = _label_prefix(interface, [f'interface="{if_name}"'])
         
-        # Voltage thresholds
-        if interface.get('voltage_high_alarm') is not None:
-            lines.append(f'voltage_high_alarm{{{base_labels}}} {interface["voltage_high_alarm"]}')
-        if interface.get('voltage_low_alarm') is not None:
-            lines.append(f'voltage_low_alarm{{{base_labels}}} {interface["voltage_low_alarm"]}')
-        if interface.get('voltage_high_warn') is not None:
-            lines.append(f'voltage_high_warn{{{base_labels}}} {interface["voltage_high_warn"]}')
-        if interface.get('voltage_low_warn') is not None:
-            lines.append(f'voltage_low_warn{{{base_labels}}} {interface["voltage_low_warn"]}')
-        
-        # TX power thresholds
-        if interface.get('tx_power_high_alarm') is not None:
-            lines.append(f'tx_power_high_alarm{{{base_labels}}} {interface["tx_power_high_alarm"]}')
-        if interface.get('tx_power_low_alarm') is not None:
-            lines.append(f'tx_power_low_alarm{{{base_labels}}} {interface["tx_power_low_alarm"]}')
-        if interface.get('tx_power_high_warn') is not None:
-            lines.append(f'tx_power_high_warn{{{base_labels}}} {interface["tx_power_high_warn"]}')
-        if interface.get('tx_power_low_warn') is not None:
-            lines.append(f'tx_power_low_warn{{{base_labels}}} {interface["tx_power_low_warn"]}')
-        
-        # RX power thresholds
-        if interface.get('rx_power_high_alarm') is not None:
-            lines.append(f'rx_power_high_alarm{{{base_labels}}} {interface["rx_power_high_alarm"]}')
-        if interface.get('rx_power_low_alarm') is not None:
-            lines.append(f'rx_power_low_alarm{{{base_labels}}} {interface["rx_power_low_alarm"]}')
-        if interface.get('rx_power_high_warn') is not None:
-            lines.append(f'rx_power_high_warn{{{base_labels}}} {interface["rx_power_high_warn"]}')
-        if interface.get('rx_power_low_warn') is not None:
-            lines.append(f'rx_power_low_warn{{{base_labels}}} {interface["rx_power_low_warn"]}')
-        
-        # TX bias current thresholds
-        if interface.get('tx_bias_high_alarm') is not None:
-            lines.append(f'tx_bias_high_alarm{{{base_labels}}} {interface["tx_bias_high_alarm"]}')
-        if interface.get('tx_bias_low_alarm') is not None:
-            lines.append(f'tx_bias_low_alarm{{{base_labels}}} {interface["tx_bias_low_alarm"]}')
-        if interface.get('tx_bias_high_warn') is not None:
-            lines.append(f'tx_bias_high_warn{{{base_labels}}} {interface["tx_bias_high_warn"]}')
-        if interface.get('tx_bias_low_warn') is not None:
-            lines.append(f'tx_bias_low_warn{{{base_labels}}} {interface["tx_bias_low_warn"]}')
-        
-        # Current measured values (always at interface level)
-        if interface.get('temperature') is not None:
-            lines.append(f'temperature{{{base_labels}}} {interface["temperature"]}')
-        if interface.get('voltage') is not None:
-            lines.append(f'voltage{{{base_labels}}} {interface["voltage"]}')
-        
-        # DOM metrics at interface level (for interfaces without lanes)
-        if interface.get('tx_bias') is not None:
-            lines.append(f'tx_bias{{{base_labels}}} {interface["tx_bias"]}')
-        if interface.get('tx_power_mw') is not None:
-            lines.append(f'tx_power_mw{{{base_labels}}} {interface["tx_power_mw"]}')
-        if interface.get('tx_power') is not None:
-            lines.append(f'tx_power{{{base_labels}}} {interface["tx_power"]}')
-        if interface.get('rx_power_mw') is not None:
-            lines.append(f'rx_power_mw{{{base_labels}}} {interface["rx_power_mw"]}')
-        if interface.get('rx_power') is not None:
-            lines.append(f'rx_power{{{base_labels}}} {interface["rx_power"]}')
+        # Thresholds and measured values
+        for key, name in _INTERFACE_METRICS:
+            value = get(key)
+            if value is not None:
+                write(name + prefix + str(value) + '\n')
         
         # Interface statistics (admin/oper status, traffic, speed)
-        if interface.get('admin_status') is not None:
-            # Convert status to numeric (0=down, 1=up)
-            admin_value = 1 if interface['admin_status'] == 'up' else 0
-            lines.append(f'interface_admin_status{{{base_labels}}} {admin_value}')
-        if interface.get('oper_status') is not None:
-            oper_value = 1 if interface['oper_status'] == 'up' else 0
-            lines.append(f'interface_oper_status{{{base_labels}}} {oper_value}')
-        if interface.get('speed_bps') is not None:
-            lines.append(f'interface_speed_bps{{{base_labels}}} {interface["speed_bps"]}')
-        if interface.get('input_bps') is not None:
-            lines.append(f'interface_input_bps{{{base_labels}}} {interface["input_bps"]}')
-        if interface.get('input_pps') is not None:
-            lines.append(f'interface_input_pps{{{base_labels}}} {interface["input_pps"]}')
-        if interface.get('output_bps') is not None:
-            lines.append(f'interface_output_bps{{{base_labels}}} {interface["output_bps"]}')
-        if interface.get('output_pps') is not None:
-            lines.append(f'interface_output_pps{{{base_labels}}} {interface["output_pps"]}')
-        
-        # FEC statistics (Forward Error Correction)
-        if interface.get('fec_ccw') is not None:
-            lines.append(f'interface_fec_ccw{{{base_labels}}} {interface["fec_ccw"]}')
-        if interface.get('fec_nccw') is not None:
-            lines.append(f'interface_fec_nccw{{{base_labels}}} {interface["fec_nccw"]}')
-        if interface.get('fec_ccw_error_rate') is not None:
-            lines.append(f'interface_fec_ccw_error_rate{{{base_labels}}} {interface["fec_ccw_error_rate"]}')
-        if interface.get('fec_nccw_error_rate') is not None:
-            lines.append(f'interface_fec_nccw_error_rate{{{base_labels}}} {interface["fec_nccw_error_rate"]}')
-        if interface.get('pre_fec_ber') is not None:
-            lines.append(f'interface_pre_fec_ber{{{base_labels}}} {interface["pre_fec_ber"]}')
+        for key, name in _INTERFACE_STATUS_METRICS:
+            value = get(key)
+            if value is not None:
+                # Convert status to numeric (0=down, 1=up)
+                write(name + prefix + ('1\n' if value == 'up' else '0\n'))
+        for key, name in _INTERFACE_STATS_METRICS:
+            value = get(key)
+            if value is not None:
+                write(name + prefix + str(value) + '\n')
         
         # FEC histogram bins (if present)
-        for i in range(16):
-            bin_key = f'histogram_bin_{i}'
-            if interface.get(bin_key) is not None:
-                lines.append(f'interface_fec_histogram_bin_{i}{{{base_labels}}} {interface[bin_key]}')
+        for key, name in _HISTOGRAM_METRICS:
+            value = get(key)
+            if value is not None:
+                write(name + prefix + str(value) + '\n')
     
     # Process lane-level metrics (measurements)
     for lane in data.get('lanes', []):
-        if_name = lane.get('if_name', 'unknown')
+        if_name = _escape_label_value(lane.get('if_name', 'unknown'))
         lane_num = lane.get('lane', 0)
         
         # Build base labels with metadata (includes lane)
-        labels = [
-            f'interface="{if_name}"',
-            f'lane="{lane_num}"'
-        ]
-        
-        # Add device-level metadata
-        if lane.get('origin_hostname'):
-            labels.append(f'origin_hostname="{lane["origin_hostname"]}"')
-        if lane.get('device_profile'):
-            labels.append(f'device_profile="{lane["device_profile"]}"')
-        if lane.get('origin_name'):
-            labels.append(f'origin_name="{lane["origin_name"]}"')
-        
-        # Add transceiver metadata
-        if lane.get('vendor'):
-            labels.append(f'vendor="{lane["vendor"]}"')
-        if lane.get('part_number'):
-            labels.append(f'part_number="{lane["part_number"]}"')
-        if lane.get('serial_number'):
-            labels.append(f'serial_number="{lane["serial_number"]}"')
-        if lane.get('media_type'):
-            labels.append(f'media_type="{lane["media_type"]}"')
-        if lane.get('cable_type'):
-            labels.append(f'cable_type="{lane["cable_type"]}"')
-        if lane.get('wavelength'):
-            labels.append(f'wavelength="{lane["wavelength"]}"')
-        if lane.get('fiber_type'):
-            labels.append(f'fiber_type="{lane["fiber_type"]}"')
+        prefix = _label_prefix(lane, [f'interface="{if_name}"', f'lane="{lane_num}"'])
         
-        base_labels = ','.join(labels)
-        
-        # RX power metrics
-        if lane.get('rx_power_mw') is not None:
-            lines.append(f'rx_power_mw{{{base_labels}}} {lane["rx_power_mw"]}')
-        if lane.get('rx_power') is not None:
-            lines.append(f'rx_power{{{base_labels}}} {lane["rx_power"]}')
-        
-        # TX power metrics
-        if lane.get('tx_power_mw') is not None:
-            lines.append(f'tx_power_mw{{{base_labels}}} {lane["tx_power_mw"]}')
-        if lane.get('tx_power') is not None:
-            lines.append(f'tx_power{{{base_labels}}} {lane["tx_power"]}')
-        
-        # TX bias current
-        if lane.get('tx_bias') is not None:
-            lines.append(f'tx_bias{{{base_labels}}} {lane["tx_bias"]}')
+        # RX power, TX power and TX bias
+        get = lane.get
+        for key, name in _LANE_METRICS:
+            value = get(key)
+            if value is not None:
+                write(name + prefix + str(value) + '\n')
     
-    # Prometheus format requires trailing newline
-    return '\n'.join(lines) + '\n'
+    # Every line already ends in a newline; an empty payload is still
+    # newline-terminated as Prometheus format requires
+    return buf.getvalue() or '\n'
 
 
 def push_metrics(pushgateway_url: str, job: str, instance: str, 
-                metrics_file: str, format_type: str = 'prom') -> bool:
+                metrics_file: str, format_type: str = 'prom',
+                session: Optional[requests.Session] = None, compress: bool = False) -> bool:
     """
     Push metrics to Prometheus Pushgateway.
     
@@ -233,16 +227,20 @@ def push_metrics(pushgateway_url: str, job: str, instance: str,
         instance: Instance label (typically device hostname/IP)
         metrics_file: Path to file containing metrics
         format_type: Format of metrics file ('json' or 'prom')
+        session: Optional requests session to reuse its pooled connections
+        compress: Send the body gzip-compressed (Content-Encoding: gzip)
     
     Returns:
         True if successful, False otherwise
     """
     try:
-        with open(metrics_file, 'r') as f:
-            if format_type == 'json':
-                data = json.load(f)
-                metrics_data = json_to_prometheus(data, job, instance)
-            else:
+        if format_type == 'json':
+            # read_json decodes with orjson when installed; its decode error
+            # subclasses json.JSONDecodeError
+            data = read_json(metrics_file)
+            metrics_data = json_to_prometheus(data, job, instance)
+        else:
+            with open(metrics_file, 'r') as f:
                 metrics_data = f.read()
     except (IOError, json.JSONDecodeError) as e:
         print(f"Error reading metrics file: {e}", file=sys.stderr)
@@ -255,11 +253,19 @@ def push_metrics(pushgateway_url: str, job: str, instance: str,
     # Construct the pushgateway URL with job and instance labels
     url = f"{pushgateway_url}/metrics/job/{job}/instance/{instance}"
     
+    body = metrics_data.encode('utf-8')
+    headers = {'Content-Type': 'text/plain; charset=utf-8'}
+    if compress:
+        # Label sets repeat on every line, so even the fastest level shrinks
+        # the body several times over
+        body = gzip.compress(body, compresslevel=1)
+        headers['Content-Encoding'] = 'gzip'
+    
     try:
-        response = requests.post(
+        response = (session or requests).post(
             url,
-            data=metrics_data.encode('utf-8'),
-            headers={'Content-Type': 'text/plain; charset=utf-8'},
+            data=body,
+            headers=headers,
             timeout=10
         )
         response.raise_for_status()
@@ -270,6 +276,55 @@ def push_metrics(pushgateway_url: str, job: str, instance: str,
         return False
 
 
+def push_many(pushgateway_url: str, job: str, items: List[Dict], compress: bool = False) -> int:
+    """
+    Push metrics of many instances over one pooled HTTP session.
+    
+    Pushes reuse the session's keep-alive connection to the Pushgateway
+    instead of opening a new TCP (and TLS) connection per instance.
+    
+    Args:
+        pushgateway_url: URL of the Pushgateway (e.g., http://localhost:9091)
+        job: Job label for the metrics
+        items: Dicts with 'instance', 'metrics_file' and optional 'format'
+            ('json' or 'prom', default 'prom')
+        compress: Send each body gzip-compressed
+    
+    Returns:
+        Number of instances that failed to push
+    """
+    failures = 0
+    with requests.Session() as session:
+        for item in items:
+            if not push_metrics(pushgateway_url, job, item['instance'], item['metrics_file'],
+                                item.get('format', 'prom'), session, compress):
+                failures += 1
+    return failures
+
+
+def _check_batch_items(items) -> None:
+    """
+    Check that decoded --batch-file contents are a list of push entries.
+    
+    Args:
+        items: Decoded batch file contents
+    
+    Raises:
+        ValueError: If items is not a list of objects with string 'instance'
+            and 'metrics_file' and an optional 'format' of 'json' or 'prom'
+    """
+    if not isinstance(items, list):
+        raise ValueError("expected a JSON array of objects")
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"entry {index}: expected an object")
+        for key in ('instance', 'metrics_file'):
+            if not isinstance(item.get(key), str) or not item[key]:
+                raise ValueError(f"entry {index}: missing or invalid '{key}'")
+        if item.get('format', 'prom') not in ('json', 'prom'):
+            raise ValueError(f"entry {index}: 'format' must be 'json' or 'prom'")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Push metrics to Prometheus Pushgateway'
@@ -278,21 +333,41 @@ def main():
                         help='Pushgateway URL (e.g., http://localhost:9091)')
     parser.add_argument('--job', required=True, 
                         help='Job label for the metrics')
-    parser.add_argument('--instance', required=True, 
+    parser.add_argument('--instance', 
                         help='Instance label (device hostname/IP)')
-    parser.add_argument('--metrics-file', required=True, 
+    parser.add_argument('--metrics-file', 
                         help='File containing metrics')
     parser.add_argument('--format', choices=['json', 'prom'], default='prom',
                         help='Format of metrics file (json or prom)')
+    parser.add_argument('--batch-file',
+                        help='JSON array of {"instance", "metrics_file", "format"} objects '
+                             'pushed over one connection instead of --instance/--metrics-file')
+    parser.add_argument('--gzip', action='store_true',
+                        help='Gzip-compress request bodies (requires a Pushgateway that accepts Content-Encoding: gzip)')
     
     args = parser.parse_args()
     
+    if args.batch_file:
+        try:
+            items = read_json(args.batch_file)
+            _check_batch_items(items)
+        except (IOError, ValueError) as e:
+            # json.JSONDecodeError (and orjson's decode error) subclass ValueError
+            print(f"Error reading batch file: {e}", file=sys.stderr)
+            sys.exit(1)
+        failures = push_many(args.pushgateway, args.job, items, args.gzip)
+        sys.exit(1 if failures else 0)
+    
+    if not (args.instance and args.metrics_file):
+        parser.error('--instance and --metrics-file are required unless --batch-file is given')
+    
     success = push_metrics(
         args.pushgateway,
         args.job,
         args.instance,
         args.metrics_file,
-        args.format
+        args.format,
+        compress=args.gzip
     )
     
     sys.exit(0 if success else 1)
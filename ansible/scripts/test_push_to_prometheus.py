@@ -4,8 +4,16 @@ Test suite for push_to_prometheus.py
 """
 
 import unittest
+import gzip
 import json
-from push_to_prometheus import json_to_prometheus
+import os
+import sys
+import tempfile
+from unittest import mock
+
+import requests
+
+from push_to_prometheus import json_to_prometheus, main, push_many, push_metrics
 
 
 class TestJsonToPrometheus(unittest.TestCase):
@@ -335,6 +343,168 @@ class TestJsonToPrometheus(unittest.TestCase):
         # Verify both interfaces have temperature/voltage without lane label
         self.assertIn('temperature{device="dcf-onyx27-jun.englab.juniper.net",interface="xe-0/0/6"} 39.0', result)
         self.assertIn('temperature{device="dcf-onyx27-jun.englab.juniper.net",interface="xe-0/0/48:2"} 28.2', result)
+    
+    def test_label_values_escaped(self):
+        """Test quote, backslash and newline in label values are escaped once per record"""
+        data = {
+            "interfaces": [
+                {
+                    "if_name": "et-0/0/0",
+                    "origin_hostname": "lab\\rack1",
+                    "vendor": "ACME \"Optics\"",
+                    "part_number": "740-1\n2",
+                    "temperature": 39.0,
+                    "voltage": 3.3
+                }
+            ],
+            "lanes": [
+                {
+                    "if_name": "et-0/0/0",
+                    "serial_number": "SN\"1\\2\n",
+                    "lane": 1,
+                    "rx_power": -1.2
+                }
+            ]
+        }
+        
+        result = json_to_prometheus(data, "test_job", "test-device")
+        
+        labels = ('{interface="et-0/0/0",origin_hostname="lab\\\\rack1",'
+                  'vendor="ACME \\"Optics\\"",part_number="740-1\\n2"}')
+        self.assertIn('temperature' + labels + ' 39.0\n', result)
+        self.assertIn('voltage' + labels + ' 3.3\n', result)
+        self.assertIn('rx_power{interface="et-0/0/0",lane="1",serial_number="SN\\"1\\\\2\\n"} -1.2\n',
+                      result)
+        # Raw newlines inside values would split metric lines
+        self.assertEqual(len(result.splitlines()), 3)
+    
+    def test_plain_label_values_unchanged(self):
+        """Test label values without escapable characters are emitted as-is"""
+        data = {
+            "interfaces": [
+                {
+                    "if_name": "et-0/0/0",
+                    "origin_hostname": "dev1.example.net",
+                    "serial_number": "1A2B3C",
+                    "wavelength": 1310,
+                    "temperature": 39.0
+                }
+            ],
+            "lanes": []
+        }
+        
+        result = json_to_prometheus(data, "test_job", "test-device")
+        
+        self.assertEqual(result, 'temperature{interface="et-0/0/0",origin_hostname="dev1.example.net",'
+                                 'serial_number="1A2B3C",wavelength="1310"} 39.0\n')
+
+
+class TestPushMany(unittest.TestCase):
+    """Test push_many batch pushes over one session"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.items = []
+        for instance in ('dev1', 'dev2', 'dev3'):
+            path = os.path.join(self.tmp.name, f'{instance}.prom')
+            with open(path, 'w') as f:
+                f.write('temperature{interface="et-0/0/0"} 39.0\n')
+            self.items.append({'instance': instance, 'metrics_file': path})
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_one_session_for_all_items(self):
+        """Test every item is posted through the same session"""
+        with mock.patch.object(requests.Session, 'post', autospec=True) as post:
+            failures = push_many('http://pushgateway:9091', 'junos_optics', self.items)
+        
+        self.assertEqual(failures, 0)
+        self.assertEqual(post.call_count, 3)
+        sessions = {id(call.args[0]) for call in post.call_args_list}
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual([call.args[1] for call in post.call_args_list], [
+            'http://pushgateway:9091/metrics/job/junos_optics/instance/dev1',
+            'http://pushgateway:9091/metrics/job/junos_optics/instance/dev2',
+            'http://pushgateway:9091/metrics/job/junos_optics/instance/dev3',
+        ])
+    
+    def test_failures_counted(self):
+        """Test failed posts and unreadable files are counted and do not stop the batch"""
+        self.items.append({'instance': 'dev4',
+                           'metrics_file': os.path.join(self.tmp.name, 'missing.prom')})
+        ok = mock.Mock()
+        rejected = mock.Mock()
+        rejected.raise_for_status.side_effect = requests.exceptions.HTTPError('400 Bad Request')
+        responses = [ok, requests.exceptions.ConnectionError('refused'), rejected]
+        
+        with mock.patch.object(requests.Session, 'post', autospec=True,
+                               side_effect=responses) as post:
+            failures = push_many('http://pushgateway:9091', 'junos_optics', self.items)
+        
+        # dev2 cannot connect, dev3 is rejected, dev4 is never posted
+        self.assertEqual(failures, 3)
+        self.assertEqual(post.call_count, 3)
+    
+    def test_malformed_batch_file(self):
+        """Test a malformed batch file exits with status 1 before any push"""
+        batch_path = os.path.join(self.tmp.name, 'batch.json')
+        for batch in ({'instance': 'dev1'}, [{'instance': 'dev1'}], ['dev1'],
+                      [{'instance': 'dev1', 'metrics_file': 'f', 'format': 'xml'}]):
+            with open(batch_path, 'w') as f:
+                json.dump(batch, f)
+            argv = ['push_to_prometheus.py', '--pushgateway', 'http://pushgateway:9091',
+                    '--job', 'junos_optics', '--batch-file', batch_path]
+            with mock.patch.object(sys, 'argv', argv), \
+                    mock.patch.object(requests.Session, 'post') as post, \
+                    mock.patch('sys.stderr'):
+                with self.assertRaises(SystemExit) as cm:
+                    main()
+            self.assertEqual(cm.exception.code, 1)
+            post.assert_not_called()
+
+
+class TestPushMetricsCompression(unittest.TestCase):
+    """Test the gzip request body option of push_metrics"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = {
+            "interfaces": [
+                {"if_name": "et-0/0/0", "origin_hostname": "dev1", "temperature": 39.0, "voltage": 3.3}
+            ],
+            "lanes": [
+                {"if_name": "et-0/0/0", "origin_hostname": "dev1", "lane": 0, "rx_power": -1.2}
+            ]
+        }
+        self.path = os.path.join(self.tmp.name, 'dev1_metrics.json')
+        with open(self.path, 'w') as f:
+            json.dump(self.data, f)
+        self.expected = json_to_prometheus(self.data, 'junos_optics', 'dev1').encode('utf-8')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def push(self, **kwargs):
+        with mock.patch('requests.post') as post:
+            self.assertTrue(push_metrics('http://pushgateway:9091', 'junos_optics', 'dev1',
+                                         self.path, 'json', **kwargs))
+        self.assertEqual(post.call_count, 1)
+        return post.call_args.kwargs
+    
+    def test_gzip_body(self):
+        """Test compressed pushes set Content-Encoding and decompress to the exposition text"""
+        sent = self.push(compress=True)
+        
+        self.assertEqual(sent['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(sent['data']), self.expected)
+    
+    def test_plain_body_by_default(self):
+        """Test pushes are uncompressed unless requested"""
+        sent = self.push()
+        
+        self.assertNotIn('Content-Encoding', sent['headers'])
+        self.assertEqual(sent['data'], self.expected)
 
 
 if __name__ == '__main__':
@@ -8,7 +8,6 @@ Creates 3 separate files per hour:
 """
 
 import argparse
-import json
 import sys
 import os
 from datetime import datetime
@@ -26,6 +25,7 @@ except ImportError:
 # Import interface mapping utilities
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from parsers.common.interface_mapping import parse_interface_base_name
+from parsers.common.json_utils import read_json
 
 
 def create_hourly_partition_path(base_dir: str, dt: datetime) -> Path:
@@ -328,21 +328,20 @@ def process_all_devices(metrics_dir: str, base_dir: str, cluster_name: str, inve
             device_data = {'origin_hostname': device, 'origin_name': device}
             
             for metric_type, file_path in metric_files.items():
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    if metric_type == 'system_information':
-                        device_data.update(data)
-                        # Set inventory_instance from device field (FQDN from inventory)
-                        device_data['inventory_instance'] = data.get('device', device)
-                    elif metric_type == 'optics_diagnostics':
-                        device_data['optics_diagnostics'] = data
-                    elif metric_type == 'interface_statistics':
-                        device_data['interface_statistics'] = data
-                    elif metric_type == 'chassis_inventory':
-                        device_data['chassis_inventory'] = data
-                        # Merge top-level fields like origin_name (device serial number)
-                        if 'origin_name' in data:
-                            device_data['origin_name'] = data['origin_name']
+                data = read_json(file_path)
+                if metric_type == 'system_information':
+                    device_data.update(data)
+                    # Set inventory_instance from device field (FQDN from inventory)
+                    device_data['inventory_instance'] = data.get('device', device)
+                elif metric_type == 'optics_diagnostics':
+                    device_data['optics_diagnostics'] = data
+                elif metric_type == 'interface_statistics':
+                    device_data['interface_statistics'] = data
+                elif metric_type == 'chassis_inventory':
+                    device_data['chassis_inventory'] = data
+                    # Merge top-level fields like origin_name (device serial number)
+                    if 'origin_name' in data:
+                        device_data['origin_name'] = data['origin_name']
             
             # Extract metrics for each type
             interface_dom = extract_interface_dom_metrics(device_data, run_timestamp)